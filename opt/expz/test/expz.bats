@@ -85,3 +85,199 @@ run_expz() {
   assert_output_contains "Schema not found"
   rm -rf "$tmpdir"
 }
+
+# ============================================================================
+# PARALLEL AND RESUME TESTS
+# ============================================================================
+
+# Print the sha256 of a file
+file_sha256() {
+  if command -v sha256sum >/dev/null 2>&1; then
+    sha256sum "$1" | cut -c1-64
+  else
+    shasum -a 256 "$1" | cut -c1-64
+  fi
+}
+
+# Print the checkpoint header for the default schema
+checkpoint_header() {
+  echo "# schema $(file_sha256 "$UTILZ_HOME/opt/expz/lib/expense_schema.json")"
+}
+
+@test "expz with invalid --jobs shows error" {
+  mkdir -p "$BATS_TEST_TMPDIR/receipts/Travel"
+  echo "%PDF-1.4" > "$BATS_TEST_TMPDIR/receipts/Travel/train.pdf"
+  run_expz "$BATS_TEST_TMPDIR/receipts" --jobs 0
+  assert_failure
+  assert_output_contains "--jobs must be a positive integer"
+}
+
+@test "expz resumes from checkpoint without re-extracting" {
+  local dir="$BATS_TEST_TMPDIR/receipts"
+  mkdir -p "$dir/Travel" "$dir/Hardware"
+  echo "%PDF-1.4 train" > "$dir/Travel/train.pdf"
+  echo "%PDF-1.4 monitor" > "$dir/Hardware/monitor.pdf"
+
+  # Pre-populate the checkpoint for both PDFs
+  local ckpt="$BATS_TEST_TMPDIR/out.csv.checkpoint"
+  checkpoint_header > "$ckpt"
+  printf '%s\t%s\t%s\n' "$(file_sha256 "$dir/Travel/train.pdf")" "Travel/train.pdf" \
+    '{"date":"2026-01-05","supplier":"GWR","description":"Train","currency":"GBP","subtotal":null,"vat":0,"total":42.5,"reference":"T1"}' >> "$ckpt"
+  printf '%s\t%s\t%s\n' "$(file_sha256 "$dir/Hardware/monitor.pdf")" "Hardware/monitor.pdf" \
+    '[{"date":"2026-02-18","supplier":"Amazon","description":"Monitor","currency":"GBP","subtotal":250,"vat":50,"total":300,"reference":null}]' >> "$ckpt"
+
+  # Dummy key: any real extraction would fail
+  ANTHROPIC_API_KEY=test run_expz "$dir" --out "$BATS_TEST_TMPDIR/out.csv"
+  assert_success
+  assert_output_contains "Resuming: 2 of 2"
+
+  run cat "$BATS_TEST_TMPDIR/out.csv"
+  assert_output 'Date,Category,Supplier,Description,Currency,Subtotal,VAT,Total,Reference,File
+"2026-02-18","Hardware","Amazon","Monitor","GBP","250","50","300","","Hardware/monitor.pdf"
+"2026-01-05","Travel","GWR","Train","GBP","","0","42.5","T1","Travel/train.pdf"'
+}
+
+@test "expz re-extracts a PDF whose content changed since the checkpoint" {
+  local dir="$BATS_TEST_TMPDIR/receipts"
+  mkdir -p "$dir/Travel"
+  echo "%PDF-1.4 train" > "$dir/Travel/train.pdf"
+
+  local ckpt="$BATS_TEST_TMPDIR/ckpt"
+  checkpoint_header > "$ckpt"
+  printf '%s\t%s\t%s\n' "0000000000000000000000000000000000000000000000000000000000000000" \
+    "Travel/train.pdf" '{"supplier":"Stale"}' >> "$ckpt"
+
+  # The changed PDF is not a real PDF, so re-extraction fails to an empty row
+  ANTHROPIC_API_KEY=test run_expz "$dir" --checkpoint "$ckpt"
+  refute_output_contains "Resuming"
+  refute_output_contains "Stale"
+  assert_output_contains '"","Travel","","","","","","","","Travel/train.pdf"'
+}
+
+@test "expz resets a checkpoint written with a different schema" {
+  local dir="$BATS_TEST_TMPDIR/receipts"
+  mkdir -p "$dir/Travel"
+  echo "%PDF-1.4 train" > "$dir/Travel/train.pdf"
+
+  local ckpt="$BATS_TEST_TMPDIR/ckpt"
+  echo "# schema 0000000000000000000000000000000000000000000000000000000000000000" > "$ckpt"
+  printf '%s\t%s\t%s\n' "$(file_sha256 "$dir/Travel/train.pdf")" "Travel/train.pdf" \
+    '{"supplier":"Stale"}' >> "$ckpt"
+
+  ANTHROPIC_API_KEY=test run_expz "$dir" --checkpoint "$ckpt"
+  assert_output_contains "different schema"
+  refute_output_contains "Resuming"
+  refute_output_contains "Stale"
+
+  run head -1 "$ckpt"
+  assert_output "$(checkpoint_header)"
+}
+
+# Put a stub xtrct on PATH that hangs on a.pdf and answers at once otherwise
+stub_slow_xtrct() {
+  mkdir -p "$BATS_TEST_TMPDIR/bin"
+  cat > "$BATS_TEST_TMPDIR/bin/xtrct" <<'STUB'
+#!/usr/bin/env bash
+case "$1" in
+  */a.pdf) echo "$$" > "$STUB_PIDFILE"; exec sleep 30 ;;
+esac
+echo '{"supplier":"Stub"}'
+STUB
+  chmod +x "$BATS_TEST_TMPDIR/bin/xtrct"
+}
+
+@test "expz checkpoints PDFs that finish behind a slower one before an interrupt" {
+  stub_slow_xtrct
+  local dir="$BATS_TEST_TMPDIR/receipts" ckpt="$BATS_TEST_TMPDIR/ckpt" n
+  mkdir -p "$dir/Travel"
+  for n in a b c d e; do echo "%PDF-1.4 $n" > "$dir/Travel/$n.pdf"; done
+
+  PATH="$BATS_TEST_TMPDIR/bin:$PATH" STUB_PIDFILE="$BATS_TEST_TMPDIR/stub.pid" ANTHROPIC_API_KEY=test \
+    "$UTILZ_BIN_DIR/expz" "$dir" --jobs 4 --checkpoint "$ckpt" > /dev/null 2>&1 &
+  local pid=$! i
+  # Header plus b-e; a.pdf is still being extracted
+  for i in $(seq 1 100); do
+    [[ -f "$ckpt" && $(wc -l < "$ckpt") -ge 5 ]] && break
+    sleep 0.1
+  done
+  kill -TERM "$pid"
+  local rc=0
+  wait "$pid" || rc=$?
+  [[ $rc -eq 130 ]] || fail "expz should exit 130 when interrupted (got $rc)"
+
+  run cut -f2 "$ckpt"
+  assert_output_contains "Travel/b.pdf"
+  assert_output_contains "Travel/e.pdf"
+  refute_output_contains "Travel/a.pdf"
+}
+
+@test "expz stops in-flight xtrct processes when terminated" {
+  stub_slow_xtrct
+  local dir="$BATS_TEST_TMPDIR/receipts" pidfile="$BATS_TEST_TMPDIR/stub.pid"
+  mkdir -p "$dir/Travel"
+  echo "%PDF-1.4 a" > "$dir/Travel/a.pdf"
+
+  PATH="$BATS_TEST_TMPDIR/bin:$PATH" STUB_PIDFILE="$pidfile" ANTHROPIC_API_KEY=test \
+    "$UTILZ_BIN_DIR/expz" "$dir" > /dev/null 2>&1 &
+  local pid=$! i
+  for i in $(seq 1 100); do [[ -s "$pidfile" ]] && break; sleep 0.1; done
+  assert_file_exists "$pidfile"
+
+  kill -TERM "$pid"
+  wait "$pid" || true
+  # The hanging xtrct must not outlive expz
+  for i in $(seq 1 20); do kill -0 "$(cat "$pidfile")" 2>/dev/null || break; sleep 0.1; done
+  if kill -0 "$(cat "$pidfile")" 2>/dev/null; then
+    kill "$(cat "$pidfile")"
+    fail "xtrct was still running after expz exited"
+  fi
+}
+
+@test "expz extracts in parallel against mock API in discovery order" {
+  require_command python3 "python3 required"
+  local dir="$BATS_TEST_TMPDIR/receipts"
+  mkdir -p "$dir/A" "$dir/B"
+  local sample="$UTILZ_HOME/opt/pdf2md/test/fixtures/sample.pdf"
+  cp "$sample" "$dir/B/one.pdf"
+  cp "$sample" "$dir/A/two.pdf"
+  cp "$sample" "$dir/A/three.pdf"
+
+  local url_file="$BATS_TEST_TMPDIR/mock_url"
+  python3 "$UTILZ_HOME/opt/xtrct/test/mock_api.py" --latency uniform:50,300 > "$url_file" 2>/dev/null &
+  local mock_pid=$!
+  local i
+  for i in $(seq 1 50); do [[ -s "$url_file" ]] && break; sleep 0.1; done
+
+  ANTHROPIC_API_KEY=mock ANTHROPIC_BASE_URL="$(head -1 "$url_file")" \
+    run_expz "$dir" --jobs 3 --out "$BATS_TEST_TMPDIR/out.csv"
+  kill "$mock_pid" 2>/dev/null || true
+  assert_success
+
+  run cut -d, -f2,10 "$BATS_TEST_TMPDIR/out.csv"
+  assert_output 'Category,File
+"A","A/three.pdf"
+"A","A/two.pdf"
+"B","B/one.pdf"'
+  assert_file_exists "$BATS_TEST_TMPDIR/out.csv.checkpoint"
+}
+
+@test "expz --pre-extract keeps locally resolved fields against mock API" {
+  require_command python3 "python3 required"
+  local dir="$BATS_TEST_TMPDIR/receipts"
+  mkdir -p "$dir/Food"
+  cp "$UTILZ_HOME/opt/expz/test/fixtures/receipt.pdf" "$dir/Food/cafe.pdf"
+
+  local url_file="$BATS_TEST_TMPDIR/mock_url"
+  python3 "$UTILZ_HOME/opt/xtrct/test/mock_api.py" > "$url_file" 2>/dev/null &
+  local mock_pid=$!
+  local i
+  for i in $(seq 1 50); do [[ -s "$url_file" ]] && break; sleep 0.1; done
+
+  ANTHROPIC_API_KEY=mock ANTHROPIC_BASE_URL="$(head -1 "$url_file")" \
+    run_expz "$dir" --pre-extract
+  kill "$mock_pid" 2>/dev/null || true
+  assert_success
+  # Date, VAT and total come from the receipt; the mock would answer 2026-01-01
+  assert_output_contains '"2026-03-03","Food","Sample supplier"'
+  assert_output_contains '"1.62","9.7"'
+}
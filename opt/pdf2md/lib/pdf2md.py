@@ -7,6 +7,8 @@ Python port of pdf2md.morethan.io (jzillmann/pdf-to-markdown), using
 pdfplumber instead of pdfjs-dist for text extraction.
 
 Pipeline:
+  0. With --skip-scanned, triage pages from their content streams and skip
+     scanned and empty pages
   1. Extract text items (chars with position/font metadata) via pdfplumber
   2. Calculate global stats (body font size, body font name)
   3. Group chars into lines by Y-position
@@ -14,15 +16,23 @@ Pipeline:
   5. Detect list items by prefix patterns
   6. Remove repetitive headers/footers
   7. Compact and emit markdown
+
+Stages 2, 4 and 6 work from running aggregates (font-size and font
+histograms, line-size counts, header/footer key counts) so that, with
+--incremental, a document that only grows by appending pages can be
+reconverted by extracting just the new pages.
 """
 
 import argparse
+import json
+import os
 import re
 import sys
 from collections import Counter
 from dataclasses import dataclass, field
 
-import pdfplumber
+# pdfplumber and pdfminer are imported where PDFs are opened and parsed:
+# loading them costs more than validating arguments, which should fail fast.
 
 
 # ============================================================================
@@ -72,28 +82,194 @@ class TextLine:
         return fonts.most_common(1)[0][0]
 
 
+@dataclass
+class RenderedPage:
+    """Markdown for one page, plus what the join needs to know about its start."""
+    lines: list = field(default_factory=list)
+    leading_blank: bool = False
+    starts_with_heading: bool = False
+
+
+@dataclass
+class DocumentState:
+    """Per-page lines and running aggregates for a document.
+
+    This is everything stages 2-7 need, so it is what --incremental persists
+    between runs: a rerun only has to extract pages added since.
+    """
+    total_pages: int = 0
+    page_lines: dict = field(default_factory=dict)
+    size_counter: Counter = field(default_factory=Counter)
+    font_counter: Counter = field(default_factory=Counter)
+    line_sizes: Counter = field(default_factory=Counter)
+    key_counts: Counter = field(default_factory=Counter)
+    signatures: dict = field(default_factory=dict)
+    rendered: dict = field(default_factory=dict)
+
+    def add_page(self, idx, spans):
+        """Fold a newly extracted page into the aggregates."""
+        lines = group_into_lines(spans, idx)
+        self.page_lines[idx] = lines
+        count_spans(spans, self.size_counter, self.font_counter)
+        self.line_sizes.update(line.max_font_size for line in lines)
+        count_repetition_keys(lines, self.key_counts)
+
+
 # ============================================================================
 # PAGE RANGE PARSING
 # ============================================================================
 
-def parse_page_range(range_str, max_pages):
-    """Parse a page range string like '1-5,7,10-12' into a set of 0-based page indices."""
-    pages = set()
+def parse_page_range(range_str):
+    """Parse a page range string like '1-5,7,10-12' into 1-based (start, end) pairs.
+
+    Only checks the syntax, so it can run before the PDF is opened. Raises
+    ValueError on a malformed range.
+    """
+    ranges = []
     for part in range_str.split(","):
-        part = part.strip()
-        if "-" in part:
-            start, end = part.split("-", 1)
-            start = max(1, int(start))
-            end = min(max_pages, int(end))
-            for p in range(start, end + 1):
-                pages.add(p - 1)
-        else:
-            p = int(part)
-            if 1 <= p <= max_pages:
-                pages.add(p - 1)
+        start, sep, end = part.strip().partition("-")
+        try:
+            start = int(start)
+            end = int(end) if sep else start
+        except ValueError:
+            raise ValueError(f"Invalid page range: {range_str}") from None
+        ranges.append((start, end))
+    return ranges
+
+
+def select_pages(page_ranges, total_pages):
+    """Return the sorted 0-based indices of the pages to process.
+
+    All pages when page_ranges is None. Ranges are clipped to the document;
+    exits with an error if none of the selected pages exist.
+    """
+    if page_ranges is None:
+        return list(range(total_pages))
+
+    pages = set()
+    for start, end in page_ranges:
+        pages.update(range(max(1, start) - 1, min(total_pages, end)))
+    if not pages:
+        print(f"Error: No valid pages in range (document has {total_pages} pages)", file=sys.stderr)
+        sys.exit(1)
     return sorted(pages)
 
 
+# ============================================================================
+# STAGE 0: TRIAGE
+# ============================================================================
+
+# Text-showing operators (Tj, TJ, ' and ") only occur inside BT/ET blocks,
+# so finding one is enough to know pdfplumber will produce chars. ' and "
+# follow a literal (...) or hex <...> string operand.
+TEXT_SHOW_PATTERN = re.compile(rb"(?<![A-Za-z0-9])T[jJ](?![A-Za-z0-9])|[)\]>]\s*['\"]")
+FONT_PATTERN = re.compile(rb"/([^\s/\[\]()<>{}%]+)\s+[-+.\d]+\s+Tf(?![A-Za-z0-9])")
+XOBJECT_PATTERN = re.compile(rb"/([^\s/\[\]()<>{}%]+)\s+Do(?![A-Za-z0-9])")
+INLINE_IMAGE_PATTERN = re.compile(rb"(?<![A-Za-z0-9])BI(?![A-Za-z0-9])")
+MAX_FORM_DEPTH = 4
+
+
+@dataclass
+class PageTriage:
+    """Cheap classification of a page: text, scanned or empty."""
+    page: int
+    type: str
+    fonts: int = 0
+    images: int = 0
+
+
+def scan_content(data, resources, depth=0):
+    """Tally text operators, fonts and images drawn by a content stream.
+
+    Follows Form XObjects so text or images nested in forms are counted.
+    Returns (text_ops, font_names, images).
+    """
+    from pdfminer.pdftypes import PDFStream, resolve1
+
+    resources = resolve1(resources) or {}
+    xobjects = resolve1(resources.get("XObject")) or {}
+
+    text_ops = len(TEXT_SHOW_PATTERN.findall(data))
+    fonts = set(FONT_PATTERN.findall(data))
+    images = len(INLINE_IMAGE_PATTERN.findall(data))
+
+    for name in XOBJECT_PATTERN.findall(data):
+        xobj = resolve1(xobjects.get(name.decode("latin-1")))
+        if not isinstance(xobj, PDFStream):
+            continue
+        subtype = getattr(resolve1(xobj.get("Subtype")), "name", None)
+        if subtype == "Image":
+            images += 1
+        elif subtype == "Form" and depth < MAX_FORM_DEPTH:
+            form_resources = xobj.get("Resources") or resources
+            form_text, form_fonts, form_images = scan_content(xobj.get_data(), form_resources, depth + 1)
+            text_ops += form_text
+            fonts |= form_fonts
+            images += form_images
+
+    return text_ops, fonts, images
+
+
+def triage_page(page, page_num):
+    """Classify a page from its content stream and resources, without layout."""
+    from pdfminer.pdftypes import resolve1
+
+    page_obj = page.page_obj
+    try:
+        data = b"\n".join(resolve1(stream).get_data() for stream in page_obj.contents)
+        text_ops, fonts, images = scan_content(data, page_obj.resources)
+    except Exception:
+        # Unreadable streams: let the full extraction decide
+        return PageTriage(page=page_num, type="text")
+
+    if text_ops:
+        page_type = "text"
+    elif images:
+        page_type = "scanned"
+    else:
+        page_type = "empty"
+
+    return PageTriage(page=page_num, type=page_type, fonts=len(fonts), images=images)
+
+
+def triage_pdf(pdf_path, page_ranges=None):
+    """Classify every selected page. Returns a JSON-ready report."""
+    import pdfplumber
+
+    try:
+        pdf = pdfplumber.open(pdf_path)
+    except Exception as e:
+        print(f"Error: Cannot open PDF file: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    total_pages = len(pdf.pages)
+    page_indices = select_pages(page_ranges, total_pages)
+
+    results = [triage_page(pdf.pages[idx], idx + 1) for idx in page_indices]
+    pdf.close()
+
+    counts = Counter(r.type for r in results)
+    if counts["text"] and counts["scanned"]:
+        doc_type = "mixed"
+    elif counts["text"]:
+        doc_type = "text"
+    elif counts["scanned"]:
+        doc_type = "scanned"
+    else:
+        doc_type = "empty"
+
+    return {
+        "file": pdf_path,
+        "total_pages": total_pages,
+        "type": doc_type,
+        "counts": {t: counts[t] for t in ("text", "scanned", "empty")},
+        "pages": [
+            {"page": r.page, "type": r.type, "fonts": r.fonts, "images": r.images}
+            for r in results
+        ],
+    }
+
+
 # ============================================================================
 # STAGE 1: EXTRACT TEXT ITEMS
 # ============================================================================
@@ -162,20 +338,17 @@ def extract_text_items(page, page_num):
 # STAGE 2: CALCULATE GLOBAL STATS
 # ============================================================================
 
-def calculate_stats(all_spans):
-    """Find the most common font size (body text) and most common font name."""
-    if not all_spans:
-        return 0, ""
-
-    size_counter = Counter()
-    font_counter = Counter()
-
-    for span in all_spans:
+def count_spans(spans, size_counter, font_counter):
+    """Add each span's character count to the font-size and font histograms."""
+    for span in spans:
         char_count = len(span.text.strip())
         if char_count > 0:
             size_counter[span.font_size] += char_count
             font_counter[span.font_name] += char_count
 
+
+def calculate_stats(size_counter, font_counter):
+    """Find the most common font size (body text) and most common font name."""
     body_size = size_counter.most_common(1)[0][0] if size_counter else 0
     body_font = font_counter.most_common(1)[0][0] if font_counter else ""
 
@@ -224,19 +397,20 @@ def group_into_lines(spans, page_num, y_tolerance=2.0):
 # STAGE 4: DETECT HEADINGS
 # ============================================================================
 
-def assign_heading_levels(lines, body_size):
-    """Assign heading levels based on font size relative to body text."""
-    heading_sizes = set()
-    for line in lines:
-        max_size = line.max_font_size
-        if max_size > body_size + 0.5:
-            heading_sizes.add(max_size)
+def heading_size_levels(line_sizes, body_size):
+    """Map line font sizes larger than body text to H1-H6 by descending size."""
+    heading_sizes = [size for size in line_sizes if size > body_size + 0.5]
 
     sorted_sizes = sorted(heading_sizes, reverse=True)
     size_to_level = {}
     for i, size in enumerate(sorted_sizes[:6]):
         size_to_level[size] = i + 1
 
+    return size_to_level
+
+
+def assign_heading_levels(lines, size_to_level):
+    """Return {line index: heading level} for lines set in a heading size."""
     headings = {}
     for i, line in enumerate(lines):
         max_size = line.max_font_size
@@ -275,27 +449,32 @@ def detect_list_items(lines):
 # STAGE 6: REMOVE REPETITIVE HEADERS/FOOTERS
 # ============================================================================
 
-def find_repetitive_elements(lines, total_pages, threshold=0.5):
-    """Find lines that appear at the same Y-position on >threshold of pages."""
+def repetition_key(line):
+    """Header/footer identity of a line: (rounded Y, stripped text), or None if blank."""
+    text = line.text.strip()
+    if not text:
+        return None
+    return (round(line.y, 0), text)
+
+
+def count_repetition_keys(lines, key_counts):
+    """Count each key once for the page these lines belong to."""
+    for key in {repetition_key(line) for line in lines}:
+        if key is not None:
+            key_counts[key] += 1
+
+
+def find_repetitive_elements(lines, key_counts, total_pages, threshold=0.5):
+    """Find lines whose key appears on >threshold of pages."""
     if total_pages < 3:
         return set()
 
-    y_text_pages = {}
-    for line in lines:
-        text = line.text.strip()
-        if not text:
-            continue
-        key = (round(line.y, 0), text)
-        if key not in y_text_pages:
-            y_text_pages[key] = set()
-        y_text_pages[key].add(line.page_num)
-
+    limit = total_pages * threshold
     remove_indices = set()
-    for (y_pos, text), page_set in y_text_pages.items():
-        if len(page_set) > total_pages * threshold:
-            for i, line in enumerate(lines):
-                if round(line.y, 0) == y_pos and line.text.strip() == text:
-                    remove_indices.add(i)
+    for i, line in enumerate(lines):
+        key = repetition_key(line)
+        if key is not None and key_counts[key] > limit:
+            remove_indices.add(i)
 
     return remove_indices
 
@@ -304,11 +483,11 @@ def find_repetitive_elements(lines, total_pages, threshold=0.5):
 # STAGE 7: COMPACT AND EMIT MARKDOWN
 # ============================================================================
 
-def emit_markdown(lines, headings, list_items, remove_set):
-    """Produce markdown output from processed lines."""
-    output = []
+def render_page(lines, headings, list_items, remove_set):
+    """Render one page's lines as markdown, independent of the pages around it."""
+    page = RenderedPage()
+    output = page.lines
     prev_was_blank = True
-    prev_page = -1
 
     for i, line in enumerate(lines):
         if i in remove_set:
@@ -316,18 +495,16 @@ def emit_markdown(lines, headings, list_items, remove_set):
 
         text = line.text.strip()
         if not text:
-            if not prev_was_blank:
+            if not output:
+                page.leading_blank = True
+            elif not prev_was_blank:
                 output.append("")
                 prev_was_blank = True
             continue
 
-        # Page break indicator
-        if line.page_num != prev_page and prev_page >= 0 and not prev_was_blank:
-            output.append("")
-
-        prev_page = line.page_num
-
         if i in headings:
+            if not output:
+                page.starts_with_heading = True
             level = headings[i]
             prefix = "#" * level
             if not prev_was_blank:
@@ -344,6 +521,30 @@ def emit_markdown(lines, headings, list_items, remove_set):
             output.append(text)
             prev_was_blank = False
 
+    return page
+
+
+def emit_markdown(pages):
+    """Join rendered pages into the final markdown document."""
+    output = []
+    prev_was_blank = True
+
+    for page in pages:
+        if not page.lines:
+            if page.leading_blank and not prev_was_blank:
+                output.append("")
+                prev_was_blank = True
+            continue
+
+        # Page break indicator
+        if not prev_was_blank:
+            output.append("")
+            if page.starts_with_heading and not page.leading_blank:
+                output.append("")
+
+        output.extend(page.lines)
+        prev_was_blank = page.lines[-1] == ""
+
     # Remove trailing blank lines
     while output and output[-1] == "":
         output.pop()
@@ -374,12 +575,116 @@ def normalize_list_item(text):
     return "- " + text
 
 
+# ============================================================================
+# INCREMENTAL STATE
+# ============================================================================
+
+STATE_VERSION = 1
+
+
+def line_record(line):
+    """Compact form of a line: only what stages 4-7 read."""
+    return [line.text, line.y, line.max_font_size]
+
+
+def line_from_record(record, page_num):
+    text, y, size = record
+    span = TextSpan(text=text, x=0.0, y=y, width=0.0, height=size, font_name="", font_size=size)
+    return TextLine(spans=[span], y=y, page_num=page_num)
+
+
+def save_state(path, state):
+    """Write state as JSON, atomically."""
+    data = {
+        "version": STATE_VERSION,
+        "total_pages": state.total_pages,
+        "pages": [
+            {
+                "page": idx,
+                "lines": [line_record(line) for line in state.page_lines[idx]],
+                "signature": state.signatures.get(idx),
+                "markdown": state.rendered[idx].lines if idx in state.rendered else None,
+                "leading_blank": state.rendered[idx].leading_blank if idx in state.rendered else False,
+                "starts_with_heading": state.rendered[idx].starts_with_heading if idx in state.rendered else False,
+            }
+            for idx in sorted(state.page_lines)
+        ],
+        # JSON keys must be strings, so histograms are stored as pairs
+        "font_sizes": list(state.size_counter.items()),
+        "fonts": list(state.font_counter.items()),
+        "line_sizes": list(state.line_sizes.items()),
+        "repetition_keys": [[y, text, count] for (y, text), count in state.key_counts.items()],
+    }
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def load_state(path):
+    """Read state written by save_state. Returns None if missing or unusable."""
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+        if data.get("version") != STATE_VERSION:
+            return None
+
+        state = DocumentState(total_pages=data["total_pages"])
+        for entry in data["pages"]:
+            idx = entry["page"]
+            state.page_lines[idx] = [line_from_record(r, idx) for r in entry["lines"]]
+            if entry["markdown"] is not None:
+                state.signatures[idx] = entry["signature"]
+                state.rendered[idx] = RenderedPage(
+                    lines=entry["markdown"],
+                    leading_blank=entry["leading_blank"],
+                    starts_with_heading=entry["starts_with_heading"],
+                )
+        state.size_counter = Counter(dict(data["font_sizes"]))
+        state.font_counter = Counter(dict(data["fonts"]))
+        state.line_sizes = Counter(dict(data["line_sizes"]))
+        state.key_counts = Counter({(y, text): count for y, text, count in data["repetition_keys"]})
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    return state
+
+
+def state_matches(state, pdf):
+    """Check the stored pages are still the start of this PDF.
+
+    Only appending pages is supported, so re-extracting the first and last
+    previously seen pages is enough to catch a replaced or rewritten file.
+    """
+    if not 0 < state.total_pages <= len(pdf.pages):
+        return False
+    if sorted(state.page_lines) != list(range(state.total_pages)):
+        return False
+
+    for idx in {0, state.total_pages - 1}:
+        spans = extract_text_items(pdf.pages[idx], idx)
+        lines = group_into_lines(spans, idx)
+        stored = state.page_lines[idx]
+        if [line_record(line) for line in lines] != [line_record(line) for line in stored]:
+            return False
+
+    return True
+
+
 # ============================================================================
 # MAIN CONVERSION
 # ============================================================================
 
-def convert_pdf(pdf_path, page_indices=None, verbose=False):
-    """Convert a PDF file to markdown."""
+def convert_pdf(pdf_path, page_ranges=None, verbose=False, state_path=None, skip_scanned=False):
+    """Convert a PDF file to markdown.
+
+    With state_path, reuse the lines, aggregates and rendered pages stored
+    by the previous run when the PDF has only gained pages since, and save
+    the updated state afterwards. With skip_scanned, pages triaged as
+    scanned or empty are not extracted.
+    """
+    import pdfplumber
+
     try:
         pdf = pdfplumber.open(pdf_path)
     except Exception as e:
@@ -391,55 +696,83 @@ def convert_pdf(pdf_path, page_indices=None, verbose=False):
         pdf.close()
         return ""
 
-    if page_indices is None:
-        page_indices = list(range(total_pages))
+    page_indices = select_pages(page_ranges, total_pages)
 
-    # Stage 1: Extract all spans
-    all_spans = []
-    page_spans = {}
+    state = None
+    if state_path and os.path.exists(state_path):
+        state = load_state(state_path)
+        if state is not None and not state_matches(state, pdf):
+            state = None
+        if verbose:
+            if state is None:
+                print(f"State does not match {pdf_path}, converting all pages", file=sys.stderr)
+            else:
+                print(f"Reusing {state.total_pages} pages from {state_path}", file=sys.stderr)
+    if state is None:
+        state = DocumentState()
+
+    # Stages 0-1: Optionally triage, then extract spans from pages not
+    # already in the state. Scanned and empty pages have no chars to extract.
     for idx in page_indices:
-        if idx >= total_pages:
+        if idx in state.page_lines:
+            continue
+        page = pdf.pages[idx]
+        page_type = triage_page(page, idx + 1).type if skip_scanned else "text"
+        if page_type != "text":
+            if verbose:
+                print(f"Skipping page {idx + 1}/{total_pages} ({page_type})", file=sys.stderr)
+            state.add_page(idx, [])
             continue
         if verbose:
             print(f"Processing page {idx + 1}/{total_pages}...", file=sys.stderr)
-        page = pdf.pages[idx]
-        spans = extract_text_items(page, idx)
-        page_spans[idx] = spans
-        all_spans.extend(spans)
+        state.add_page(idx, extract_text_items(page, idx))
+    state.total_pages = total_pages
+    pdf.close()
 
-    if not all_spans:
-        pdf.close()
+    # Stages 1 and 3 ran per page in add_page; stages 2, 4 and 6 read the
+    # aggregates, so their cost no longer grows with the pages reused
+    all_lines = [line for idx in page_indices for line in state.page_lines[idx]]
+    if not all_lines:
+        # Still save, so a rerun does not extract these pages again
+        if state_path:
+            save_state(state_path, state)
         if verbose:
             print("No text found in PDF", file=sys.stderr)
         return ""
 
     # Stage 2: Calculate global stats
-    body_size, body_font = calculate_stats(all_spans)
+    body_size, body_font = calculate_stats(state.size_counter, state.font_counter)
     if verbose:
         print(f"Body font: {body_font}, size: {body_size}", file=sys.stderr)
 
-    # Stage 3: Group into lines
-    all_lines = []
-    for idx in page_indices:
-        if idx in page_spans:
-            lines = group_into_lines(page_spans[idx], idx)
-            all_lines.extend(lines)
-
-    # Stage 4: Detect headings
-    headings = assign_heading_levels(all_lines, body_size)
+    size_to_level = heading_size_levels(state.line_sizes, body_size)
 
-    # Stage 5: Detect list items
-    list_items = detect_list_items(all_lines)
-
-    # Stage 6: Remove repetitive elements
-    remove_set = find_repetitive_elements(all_lines, total_pages)
-
-    # Stage 7: Emit markdown
-    result = emit_markdown(all_lines, headings, list_items, remove_set)
-
-    pdf.close()
+    # Stages 4-7 per page. A page is re-rendered only when its heading or
+    # header/footer classification differs from the stored rendering.
+    pages = []
+    rerendered = 0
+    for idx in page_indices:
+        lines = state.page_lines[idx]
+        headings = assign_heading_levels(lines, size_to_level)
+        remove_set = find_repetitive_elements(lines, state.key_counts, total_pages)
+        signature = [sorted(headings.items()), sorted(remove_set)]
+        # Compare in the stored (JSON) form: lists, not tuples
+        signature = json.loads(json.dumps(signature))
+
+        if idx not in state.rendered or state.signatures.get(idx) != signature:
+            list_items = detect_list_items(lines)
+            state.rendered[idx] = render_page(lines, headings, list_items, remove_set)
+            state.signatures[idx] = signature
+            rerendered += 1
+        pages.append(state.rendered[idx])
+
+    result = emit_markdown(pages)
+
+    if state_path:
+        save_state(state_path, state)
     if verbose:
-        print(f"Conversion complete: {len(all_lines)} lines from {len(page_indices)} pages", file=sys.stderr)
+        print(f"Conversion complete: {len(all_lines)} lines from {len(page_indices)} pages "
+              f"({rerendered} rendered)", file=sys.stderr)
 
     return result
 
@@ -456,12 +789,34 @@ def main():
     parser.add_argument("file", help="Path to PDF file")
     parser.add_argument("-o", "--output", help="Write to file instead of stdout")
     parser.add_argument("--pages", help='Page range (e.g., "1-5", "3,7,10-12")')
+    parser.add_argument("--incremental", metavar="STATE",
+                        help="Reuse and update conversion state in STATE (for PDFs that grow by appending pages)")
+    parser.add_argument("--triage", action="store_true",
+                        help="Classify pages as text, scanned or empty and print JSON instead of converting")
+    parser.add_argument("--skip-scanned", action="store_true",
+                        help="Triage pages first and skip scanned and empty pages")
     parser.add_argument("--verbose", action="store_true", help="Show progress to stderr")
 
     args = parser.parse_args()
 
+    if args.incremental and args.pages:
+        print("Error: --incremental cannot be combined with --pages", file=sys.stderr)
+        sys.exit(1)
+
+    if args.incremental and args.triage:
+        print("Error: --incremental cannot be combined with --triage", file=sys.stderr)
+        sys.exit(1)
+
+    # Check the page range syntax before opening (and importing) anything
+    page_ranges = None
+    if args.pages:
+        try:
+            page_ranges = parse_page_range(args.pages)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
     # Validate input file
-    import os
     if not os.path.isfile(args.file):
         print(f"Error: File not found: {args.file}", file=sys.stderr)
         sys.exit(1)
@@ -470,24 +825,12 @@ def main():
         print(f"Error: Not a PDF file: {args.file}", file=sys.stderr)
         sys.exit(1)
 
-    # Parse page range
-    page_indices = None
-    if args.pages:
-        # We need to peek at page count first
-        try:
-            pdf = pdfplumber.open(args.file)
-            max_pages = len(pdf.pages)
-            pdf.close()
-        except Exception as e:
-            print(f"Error: Cannot open PDF file: {e}", file=sys.stderr)
-            sys.exit(1)
-        page_indices = parse_page_range(args.pages, max_pages)
-        if not page_indices:
-            print(f"Error: No valid pages in range: {args.pages}", file=sys.stderr)
-            sys.exit(1)
-
-    # Convert
-    result = convert_pdf(args.file, page_indices=page_indices, verbose=args.verbose)
+    # Convert, or only classify pages
+    if args.triage:
+        result = json.dumps(triage_pdf(args.file, page_ranges=page_ranges), indent=2) + "\n"
+    else:
+        result = convert_pdf(args.file, page_ranges=page_ranges, verbose=args.verbose,
+                             state_path=args.incremental, skip_scanned=args.skip_scanned)
 
     # Output
     if args.output:
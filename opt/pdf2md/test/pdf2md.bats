@@ -122,6 +122,21 @@ FIXTURES_DIR="$UTILZ_HOME/opt/pdf2md/test/fixtures"
   refute_output_contains "Introduction"
 }
 
+@test "pdf2md --pages with an invalid range shows error" {
+  require_command python3 "python3 required"
+  run_pdf2md "$FIXTURES_DIR/sample.pdf" --pages abc
+  assert_failure
+  assert_output_contains "Invalid page range: abc"
+  refute_output_contains "Traceback"
+}
+
+@test "pdf2md --pages beyond the last page shows error" {
+  require_command python3 "python3 required"
+  run_pdf2md "$FIXTURES_DIR/sample.pdf" --pages 99
+  assert_failure
+  assert_output_contains "No valid pages in range"
+}
+
 @test "pdf2md --verbose shows progress on stderr" {
   require_command python3 "python3 required"
   # Run and capture stderr separately
@@ -136,3 +151,146 @@ FIXTURES_DIR="$UTILZ_HOME/opt/pdf2md/test/fixtures"
   assert_success
   assert_output_contains "- "
 }
+
+# ============================================================================
+# INCREMENTAL CONVERSION
+# ============================================================================
+
+@test "pdf2md --incremental matches a full conversion and writes state" {
+  require_command python3 "python3 required"
+  local state="$BATS_TEST_TMPDIR/state.json"
+  run_pdf2md "$FIXTURES_DIR/statement-3.pdf"
+  local full_output="$output"
+
+  run_pdf2md "$FIXTURES_DIR/statement-3.pdf" --incremental "$state"
+  assert_success
+  assert_file_exists "$state"
+  [[ "$output" == "$full_output" ]]
+}
+
+@test "pdf2md --incremental extracts only appended pages" {
+  require_command python3 "python3 required"
+  local state="$BATS_TEST_TMPDIR/state.json"
+  run_pdf2md "$FIXTURES_DIR/statement-5.pdf"
+  local full_output="$output"
+
+  run_pdf2md "$FIXTURES_DIR/statement-3.pdf" --incremental "$state"
+  assert_success
+
+  run_pdf2md "$FIXTURES_DIR/statement-5.pdf" --incremental "$state" -o "$BATS_TEST_TMPDIR/out.md" --verbose
+  assert_success
+  assert_output_contains "Reusing 3 pages"
+  assert_output_contains "Processing page 4/5"
+  refute_output_contains "Processing page 3/5"
+  [[ "$(cat "$BATS_TEST_TMPDIR/out.md")" == "$full_output" ]]
+}
+
+@test "pdf2md --incremental saves state for a PDF with no text yet" {
+  require_command python3 "python3 required"
+  local state="$BATS_TEST_TMPDIR/state.json"
+  run_pdf2md "$FIXTURES_DIR/scanned.pdf" --incremental "$state"
+  assert_success
+  assert_file_exists "$state"
+
+  run bash -c "'$UTILZ_BIN_DIR/pdf2md' '$FIXTURES_DIR/scanned.pdf' --incremental '$state' --verbose 2>&1"
+  assert_success
+  assert_output_contains "Reusing 2 pages"
+  refute_output_contains "Processing page"
+}
+
+@test "pdf2md --incremental ignores state from a different PDF" {
+  require_command python3 "python3 required"
+  local state="$BATS_TEST_TMPDIR/state.json"
+  run_pdf2md "$FIXTURES_DIR/statement-5.pdf"
+  local full_output="$output"
+
+  run_pdf2md "$FIXTURES_DIR/sample.pdf" --incremental "$state"
+  assert_success
+
+  run_pdf2md "$FIXTURES_DIR/statement-5.pdf" --incremental "$state"
+  assert_success
+  [[ "$output" == "$full_output" ]]
+}
+
+@test "pdf2md --incremental with --pages shows error" {
+  require_command python3 "python3 required"
+  run_pdf2md "$FIXTURES_DIR/statement-5.pdf" --incremental "$BATS_TEST_TMPDIR/state.json" --pages 1
+  assert_failure
+  assert_output_contains "cannot be combined"
+}
+
+# ============================================================================
+# PAGE TRIAGE
+# ============================================================================
+
+@test "pdf2md --triage classifies text, scanned and empty pages" {
+  require_command python3 "python3 required"
+  run_pdf2md "$FIXTURES_DIR/mixed.pdf" --triage
+  assert_success
+  assert_output_contains '"type": "mixed"'
+  assert_output_contains '"text": 2'
+  assert_output_contains '"scanned": 1'
+  assert_output_contains '"empty": 1'
+}
+
+@test "pdf2md --triage reports a text-only document" {
+  require_command python3 "python3 required"
+  run_pdf2md "$FIXTURES_DIR/sample.pdf" --triage
+  assert_success
+  assert_output_contains '"type": "text"'
+  refute_output_contains '"type": "scanned"'
+}
+
+@test "pdf2md --skip-scanned skips scanned and empty pages before extraction" {
+  require_command python3 "python3 required"
+  run bash -c "'$UTILZ_BIN_DIR/pdf2md' '$FIXTURES_DIR/mixed.pdf' --skip-scanned --verbose 2>&1"
+  assert_success
+  assert_output_contains "Skipping page 2/4 (scanned)"
+  assert_output_contains "Skipping page 3/4 (empty)"
+  assert_output_contains "Typed Page 1"
+  assert_output_contains "Typed Page 4"
+}
+
+@test "pdf2md does not triage during conversion by default" {
+  require_command python3 "python3 required"
+  run bash -c "'$UTILZ_BIN_DIR/pdf2md' '$FIXTURES_DIR/mixed.pdf' --verbose 2>&1"
+  assert_success
+  refute_output_contains "Skipping page"
+  assert_output_contains "Typed Page 4"
+}
+
+@test "pdf2md triage counts ' and \" after hex strings as text" {
+  require_command python3 "python3 required"
+  run "$UTILZ_HOME/opt/pdf2md/lib/.venv/bin/python3" -c '
+import sys
+sys.path.insert(0, sys.argv[1])
+from pdf2md import TEXT_SHOW_PATTERN
+for data in (b"BT <48656c6c6f> Tj ET", b"BT <48656c6c6f>'"'"' ET", b"BT 0 0 <4869>\" ET", b"q 1 0 0 1 0 0 cm Q"):
+    print(len(TEXT_SHOW_PATTERN.findall(data)))
+' "$UTILZ_HOME/opt/pdf2md/lib"
+  assert_success
+  assert_output "1
+1
+1
+0"
+}
+
+@test "pdf2md --triage with --incremental shows error" {
+  require_command python3 "python3 required"
+  run_pdf2md "$FIXTURES_DIR/mixed.pdf" --triage --incremental "$BATS_TEST_TMPDIR/state.json"
+  assert_failure
+  assert_output_contains "cannot be combined"
+}
+
+# ============================================================================
+# START-UP
+# ============================================================================
+
+@test "pdf2md starts within the default ceiling without importing pdfplumber" {
+  require_command python3 "python3 required"
+  # Default --max-ttfb-ms ceiling; also fails if any trivial invocation imports pdfplumber
+  run python3 "$UTILZ_HOME/opt/utilz/test/bench_startup.py" --tools pdf2md --runs 3
+  assert_success
+  assert_output_contains "eager heavy imports: none"
+  refute_output_contains "exceeds"
+}
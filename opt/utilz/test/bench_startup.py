@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+bench_startup - Cold-start benchmark for the Python-backed utilities
+
+Measures, for pdf2md and xtrct:
+
+  - Engine import cost, from `python -X importtime` in the tool's venv: the
+    module's cumulative import time, and whether any dependency that should
+    be deferred (pdfplumber, pdfminer, anthropic) is imported at module load.
+  - Time to first byte of trivial invocations through bin/<tool> (argument
+    errors, --metrics-summary): wrapper, venv check, interpreter start-up
+    and imports, up to the first byte of output. One extra run of each,
+    with PYTHONPROFILEIMPORTTIME set, checks that it does not import a
+    deferred dependency either.
+
+Exits non-zero if a deferred dependency is imported at module load or by
+a trivial invocation, if a median time to first byte exceeds --max-ttfb-ms
+(default 300), or if any median regresses past a saved --baseline by more
+than --tolerance. Stdlib only, so it runs with the system python3:
+
+  python3 opt/utilz/test/bench_startup.py --runs 20
+  python3 opt/utilz/test/bench_startup.py --save-baseline startup.json
+  python3 opt/utilz/test/bench_startup.py --baseline startup.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+UTILZ_HOME = os.environ.get("UTILZ_HOME") or os.path.abspath(os.path.join(TEST_DIR, "../../.."))
+sys.path.insert(0, os.path.join(UTILZ_HOME, "opt", "xtrct", "lib"))
+
+from xtrct import percentile  # noqa: E402  (stdlib-only at import time)
+
+# Added to baseline limits so sub-millisecond timer noise on small numbers
+# does not fail the gate
+NOISE_MS = 5.0
+
+# Default --max-ttfb-ms. Trivial invocations take about 50 ms; importing
+# anthropic on start-up took xtrct past 1 s. Loose enough for slow machines.
+DEFAULT_MAX_TTFB_MS = 300.0
+
+TOOLS = {
+    "pdf2md": {
+        "deferred": ["pdfplumber", "pdfminer"],
+        "invocations": [
+            ("no arguments", []),
+            ("missing file", ["/nonexistent/bench_startup.pdf"]),
+            ("invalid --pages", [
+                "--pages", "abc",
+                os.path.join(UTILZ_HOME, "opt/pdf2md/test/fixtures/sample.pdf"),
+            ]),
+        ],
+    },
+    "xtrct": {
+        "deferred": ["anthropic"],
+        "invocations": [
+            ("missing --schema", ["/nonexistent/bench_startup.md"]),
+            ("--metrics-summary", [
+                "--metrics-summary",
+                os.path.join(UTILZ_HOME, "opt/xtrct/test/fixtures/sample_metrics.jsonl"),
+            ]),
+        ],
+    },
+}
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output into {module: cumulative microseconds}."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # header line
+        modules[parts[2].strip()] = int(parts[1])
+    return modules
+
+
+def deferred_imports(tool, modules):
+    """Return the top-level deferred packages of tool found in modules."""
+    return sorted({
+        name.split(".")[0] for name in modules
+        for dep in TOOLS[tool]["deferred"]
+        if name == dep or name.startswith(dep + ".")
+    })
+
+
+def measure_import(tool, runs):
+    """Import the engine under -X importtime. Returns (best ms, eager deferred modules)."""
+    lib_dir = os.path.join(UTILZ_HOME, "opt", tool, "lib")
+    python = os.path.join(lib_dir, ".venv", "bin", "python3")
+    code = f"import sys; sys.path.insert(0, {lib_dir!r}); import {tool}"
+
+    best = None
+    eager = set()
+    for _ in range(runs):
+        result = subprocess.run(
+            [python, "-X", "importtime", "-c", code],
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        if result.returncode != 0:
+            print(f"Error: Cannot import {tool}:\n{result.stderr[-2000:]}", file=sys.stderr)
+            sys.exit(1)
+        modules = parse_importtime(result.stderr)
+        ms = modules.get(tool, 0) / 1000
+        best = ms if best is None else min(best, ms)
+        eager.update(deferred_imports(tool, modules))
+
+    return best, sorted(eager)
+
+
+def time_to_first_byte(argv, env):
+    """Run a command and return milliseconds until its first output byte."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env)
+    proc.stdout.read(1)
+    elapsed = (time.perf_counter() - start) * 1000
+    proc.stdout.read()
+    proc.wait()
+    return elapsed
+
+
+def invocation_imports(argv, env):
+    """Run a command with import profiling and return the modules it imported."""
+    result = subprocess.run(
+        argv, env=dict(env, PYTHONPROFILEIMPORTTIME="1"),
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def run_tool(tool, runs, env):
+    """Benchmark one tool. Returns a result dict."""
+    bin_path = os.path.join(UTILZ_HOME, "bin", tool)
+    invocations = []
+    for label, args in TOOLS[tool]["invocations"]:
+        # Warm-up creates the venv on first use and writes bytecode caches
+        time_to_first_byte([bin_path, *args], env)
+        samples = sorted(time_to_first_byte([bin_path, *args], env) for _ in range(runs))
+        invocations.append({
+            "label": label,
+            "args": args,
+            "ttfb_ms": {
+                "p50": round(percentile(samples, 50), 1),
+                "p95": round(percentile(samples, 95), 1),
+            },
+            "eager_imports": deferred_imports(tool, invocation_imports([bin_path, *args], env)),
+        })
+
+    import_ms, eager = measure_import(tool, runs)
+    return {
+        "tool": tool,
+        "import_ms": round(import_ms, 1),
+        "eager_imports": eager,
+        "invocations": invocations,
+    }
+
+
+def check(results, baseline, tolerance, max_ttfb_ms):
+    """Return a list of failure messages."""
+    failures = []
+    base_tools = {r["tool"]: r for r in (baseline or {}).get("results", [])}
+
+    def regressed(name, value, base_value):
+        limit = base_value * (1 + tolerance) + NOISE_MS
+        if value > limit:
+            failures.append(f"{name}: {value:.1f} ms exceeds baseline {base_value:.1f} ms "
+                            f"(limit {limit:.1f} ms)")
+
+    for r in results:
+        tool = r["tool"]
+        if r["eager_imports"]:
+            failures.append(f"{tool}: imports {', '.join(r['eager_imports'])} at module load")
+
+        base = base_tools.get(tool)
+        if base:
+            regressed(f"{tool} import", r["import_ms"], base["import_ms"])
+        base_invocations = {i["label"]: i for i in (base or {}).get("invocations", [])}
+
+        for inv in r["invocations"]:
+            name = f"{tool} {inv['label']}"
+            if inv["eager_imports"]:
+                failures.append(f"{name}: imports {', '.join(inv['eager_imports'])}")
+            p50 = inv["ttfb_ms"]["p50"]
+            if max_ttfb_ms and p50 > max_ttfb_ms:
+                failures.append(f"{name}: median {p50:.1f} ms exceeds {max_ttfb_ms:.1f} ms")
+            if inv["label"] in base_invocations:
+                regressed(name, p50, base_invocations[inv["label"]]["ttfb_ms"]["p50"])
+
+    return failures
+
+
+def format_results(results, runs):
+    """Format results as an aligned text table."""
+    headers = ["tool", "invocation", "ttfb p50", "ttfb p95", "eager imports"]
+    rows = [
+        [r["tool"], inv["label"], f"{inv['ttfb_ms']['p50']:.1f}", f"{inv['ttfb_ms']['p95']:.1f}",
+         ", ".join(inv["eager_imports"]) or "none"]
+        for r in results for inv in r["invocations"]
+    ]
+    widths = [max(len(h), *(len(row[i]) for row in rows)) for i, h in enumerate(headers)]
+    lines = [f"{runs} runs per invocation (ms)"]
+    lines.append("  ".join(h.ljust(w) for h, w in zip(headers, widths)).rstrip())
+    lines.append("  ".join("-" * w for w in widths))
+    lines.extend("  ".join(c.ljust(w) for c, w in zip(row, widths)).rstrip() for row in rows)
+    lines.append("")
+    for r in results:
+        eager = ", ".join(r["eager_imports"]) or "none"
+        lines.append(f"{r['tool']}: import {r['import_ms']:.1f} ms, eager heavy imports: {eager}")
+    return "\n".join(lines) + "\n"
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="bench_startup",
+        description="Benchmark cold-start time of the Python-backed utilities",
+    )
+    parser.add_argument("--tools", default=",".join(TOOLS),
+                        help="Comma-separated tools (default: all)")
+    parser.add_argument("--runs", type=int, default=10, help="Timed runs per invocation (default: 10)")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    parser.add_argument("--max-ttfb-ms", type=float, default=DEFAULT_MAX_TTFB_MS,
+                        help=f"Fail if any median time to first byte exceeds this "
+                             f"(default: {DEFAULT_MAX_TTFB_MS:.0f}; 0 disables)")
+    parser.add_argument("--baseline", help="Fail on regression against results saved with --save-baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown against --baseline as a fraction (default: 0.25)")
+    parser.add_argument("--save-baseline", metavar="FILE", help="Write results as JSON to FILE")
+    args = parser.parse_args()
+
+    tools = [t for t in args.tools.split(",") if t]
+    unknown = [t for t in tools if t not in TOOLS]
+    if unknown:
+        print(f"Error: Unknown tool: {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(1)
+    if args.runs < 1:
+        print("Error: --runs must be at least 1", file=sys.stderr)
+        sys.exit(1)
+
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline, "r") as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: Cannot read baseline: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    env = dict(os.environ)
+    env["UTILZ_HOME"] = UTILZ_HOME
+    # xtrct's wrapper checks the key is set before starting Python
+    env["ANTHROPIC_API_KEY"] = env.get("ANTHROPIC_API_KEY") or "bench-key"
+
+    results = [run_tool(tool, args.runs, env) for tool in tools]
+    report = {"runs": args.runs, "results": results}
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        sys.stdout.write(format_results(results, args.runs))
+
+    failures = check(results, baseline, args.tolerance, args.max_ttfb_ms)
+    for failure in failures:
+        print(f"Error: {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,18 +9,32 @@ according to a JSON schema template. Supports markdown, text, and PDF input
 
 import argparse
 import csv
-import io
 import json
 import os
 import re
 import subprocess
 import sys
+import time
 
-import anthropic
+# anthropic is imported in call_claude: it takes longer to load than the rest
+# of a typical run, and argument errors, --metrics-summary and fully local
+# --pre-extract runs never need it.
 
 
 DEFAULT_MODEL = "claude-haiku-4-5-20251001"
 
+# USD per million tokens: (input, output, cache write, cache read).
+# Matched by model-name prefix; unknown models get a null cost estimate.
+MODEL_PRICING = {
+    "claude-haiku-4-5": (1.00, 5.00, 1.25, 0.10),
+    "claude-3-5-haiku": (0.80, 4.00, 1.00, 0.08),
+    "claude-sonnet-4": (3.00, 15.00, 3.75, 0.30),
+    "claude-3-7-sonnet": (3.00, 15.00, 3.75, 0.30),
+    "claude-opus-4-5": (5.00, 25.00, 6.25, 0.50),
+    "claude-opus-4-6": (5.00, 25.00, 6.25, 0.50),
+    "claude-opus-4": (15.00, 75.00, 18.75, 1.50),
+}
+
 
 # ============================================================================
 # DOCUMENT READING
@@ -97,6 +111,285 @@ def load_schema(schema_path):
     return schema
 
 
+# ============================================================================
+# LOCAL PRE-EXTRACTION
+# ============================================================================
+
+# Minimum confidence for a locally extracted value to be trusted
+PRE_EXTRACT_MIN_CONFIDENCE = 0.9
+
+MONTH_NAMES = [
+    "january", "february", "march", "april", "may", "june",
+    "july", "august", "september", "october", "november", "december",
+]
+MONTHS = {name: i + 1 for i, name in enumerate(MONTH_NAMES)}
+MONTHS.update({name[:3]: i + 1 for i, name in enumerate(MONTH_NAMES)})
+MONTHS["sept"] = 9
+
+DATE_PATTERNS = [
+    # 2026-01-15
+    (re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b"), "ymd"),
+    # 15 January 2026, 15 Jan 2026
+    (re.compile(r"\b(\d{1,2})(?:st|nd|rd|th)?\s+([A-Za-z]{3,9})\.?,?\s+(\d{4})\b"), "dmy_name"),
+    # January 15, 2026
+    (re.compile(r"\b([A-Za-z]{3,9})\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})\b"), "mdy_name"),
+    # 15/01/2026 or 01/15/2026 (only when the day is unambiguous)
+    (re.compile(r"\b(\d{1,2})[/.](\d{1,2})[/.](\d{4})\b"), "slash"),
+]
+
+AMOUNT_PATTERN = re.compile(r"(?<![\d.])-?\d{1,3}(?:,\d{3})+(?:\.\d{1,2})?(?![\d%])|(?<![\d.,])-?\d+(?:\.\d{1,2})?(?![\d.%])")
+TAX_PATTERN = re.compile(r"\b(vat|gst|tax|hst|pst)\b", re.IGNORECASE)
+SUBTOTAL_PATTERN = re.compile(r"\bsub[\s-]?total\b", re.IGNORECASE)
+TOTAL_PATTERN = re.compile(r"\btotal\b", re.IGNORECASE)
+INCLUSIVE_PATTERN = re.compile(r"\b(inc|incl|including|inclusive)\b", re.IGNORECASE)
+# "Total items: 3", "Total savings: £2.00": totals that are not the amount paid
+NOT_PAID_TOTAL_PATTERN = re.compile(
+    r"\b(items?|qty|quantity|units?|savings?|saved|discounts?|points)\b", re.IGNORECASE
+)
+REFERENCE_PATTERN = re.compile(
+    r"\b(?:(?:invoice|receipt|order)\s*(?:no\.?|number|num|#|id)|reference|ref\.?)\s*[:#]?\s*"
+    r"([A-Z0-9][A-Z0-9\-/_.]*[A-Z0-9])",
+    re.IGNORECASE,
+)
+
+CURRENCY_CODES = {
+    "GBP", "USD", "EUR", "AUD", "CAD", "NZD", "CHF", "JPY",
+    "SEK", "NOK", "DKK", "SGD", "HKD", "INR", "ZAR",
+}
+DOLLAR_CODES = {"USD", "AUD", "CAD", "NZD", "SGD", "HKD"}
+CURRENCY_SYMBOLS = [
+    (re.compile(r"£"), "GBP"),
+    (re.compile(r"€"), "EUR"),
+    (re.compile(r"\bA\$|\bAU\$"), "AUD"),
+    (re.compile(r"\bUS\$"), "USD"),
+    (re.compile(r"\bC\$|\bCA\$"), "CAD"),
+    (re.compile(r"\bNZ\$"), "NZD"),
+]
+CURRENCY_MARK = r"[£€$]|\b(?:" + "|".join(sorted(CURRENCY_CODES)) + r")\b"
+MONEY_BEFORE = re.compile(rf"(?:{CURRENCY_MARK})\s*$")
+MONEY_AFTER = re.compile(rf"^\s*(?:{CURRENCY_MARK})")
+
+
+def clean_line(line):
+    """Strip markdown emphasis and table pipes from a line."""
+    return re.sub(r"[*_|`]+", " ", line).strip()
+
+
+def parse_dates(text):
+    """Return ISO dates found in text. Ambiguous day/month dates are skipped."""
+    found = []
+    for pattern, kind in DATE_PATTERNS:
+        for m in pattern.finditer(text):
+            try:
+                if kind == "ymd":
+                    year, month, day = int(m.group(1)), int(m.group(2)), int(m.group(3))
+                elif kind == "dmy_name":
+                    day, month, year = int(m.group(1)), MONTHS[m.group(2).lower()], int(m.group(3))
+                elif kind == "mdy_name":
+                    month, day, year = MONTHS[m.group(1).lower()], int(m.group(2)), int(m.group(3))
+                else:
+                    a, b, year = int(m.group(1)), int(m.group(2)), int(m.group(3))
+                    if a > 12 >= b:
+                        day, month = a, b
+                    elif b > 12 >= a:
+                        day, month = b, a
+                    elif a == b:
+                        day = month = a
+                    else:
+                        continue
+            except KeyError:
+                continue
+            if 1 <= month <= 12 and 1 <= day <= 31:
+                found.append(f"{year:04d}-{month:02d}-{day:02d}")
+    return found
+
+
+def parse_amount(line, first=False, money=False):
+    """Return the last (or first) monetary amount on a line, or None.
+
+    With money, only amounts with two decimal places or a currency symbol
+    or code beside them count, so a bare count such as "3" is ignored.
+    """
+    for pattern, _ in DATE_PATTERNS:
+        line = pattern.sub(" ", line)
+    amounts = [
+        m.group() for m in AMOUNT_PATTERN.finditer(line)
+        if not money or re.search(r"\.\d\d$", m.group())
+        or MONEY_BEFORE.search(line, 0, m.start()) or MONEY_AFTER.match(line[m.end():])
+    ]
+    if not amounts:
+        return None
+    value = float(amounts[0 if first else -1].replace(",", ""))
+    return int(value) if value.is_integer() else value
+
+
+def unique_value(values, confidence):
+    """Return (value, confidence) if all candidates agree, else None."""
+    distinct = set(values)
+    if len(distinct) == 1:
+        return values[0], confidence
+    return None
+
+
+def extract_date(name, spec, lines):
+    """Dates on a line labelled 'date' (or 'due' for due dates)."""
+    due = "due" in name.lower().split("_")
+    labelled = []
+    for line in lines:
+        lower = line.lower()
+        if "date" not in lower and not (due and "due" in lower):
+            continue
+        if due != ("due" in lower or "expir" in lower):
+            continue
+        labelled.extend(parse_dates(line))
+    if labelled:
+        return unique_value(labelled, 0.95)
+    # A lone unlabelled date is plausible but not trusted on its own
+    return unique_value([d for line in lines for d in parse_dates(line)], 0.8)
+
+
+def extract_subtotal(name, spec, lines):
+    values = [parse_amount(l) for l in lines if SUBTOTAL_PATTERN.search(l)]
+    return unique_value([v for v in values if v is not None], 0.95)
+
+
+def extract_total(name, spec, lines):
+    values = []
+    for line in lines:
+        if not TOTAL_PATTERN.search(line) or SUBTOTAL_PATTERN.search(line):
+            continue
+        if NOT_PAID_TOTAL_PATTERN.search(line):
+            continue
+        if TAX_PATTERN.search(line):
+            # "Total VAT" is a tax line; "Total (inc VAT)" is the total
+            if not INCLUSIVE_PATTERN.search(line):
+                continue
+            # "Total: 123.45 (incl. VAT 20.58)": the total is the amount
+            # after its label, not the last amount on the line
+            values.append(parse_amount(line[TOTAL_PATTERN.search(line).end():], first=True, money=True))
+            continue
+        values.append(parse_amount(line, money=True))
+    return unique_value([v for v in values if v is not None], 0.95)
+
+
+def extract_tax(name, spec, lines):
+    values = []
+    for line in lines:
+        if not TAX_PATTERN.search(line) or SUBTOTAL_PATTERN.search(line):
+            continue
+        if INCLUSIVE_PATTERN.search(line) or re.search(r"\b(ex|excl|excluding)\b", line, re.IGNORECASE):
+            continue
+        if re.search(r"\b(number|no\.?|reg|registration|id)\b", line, re.IGNORECASE):
+            continue
+        values.append(parse_amount(line))
+    return unique_value([v for v in values if v is not None], 0.95)
+
+
+def extract_currency(name, spec, lines):
+    text = "\n".join(lines)
+    codes = {code for code in re.findall(r"\b[A-Z]{3}\b", text) if code in CURRENCY_CODES}
+    for pattern, code in CURRENCY_SYMBOLS:
+        if pattern.search(text):
+            codes.add(code)
+    if len(codes) != 1:
+        return None
+    code = codes.pop()
+    # A bare "$" must agree with a dollar currency
+    if "$" in text and code not in DOLLAR_CODES:
+        return None
+    return code, 0.95
+
+
+def extract_reference(name, spec, lines):
+    values = [
+        m.group(1) for line in lines for m in REFERENCE_PATTERN.finditer(line)
+        if re.search(r"\d", m.group(1))
+    ]
+    return unique_value(values, 0.9)
+
+
+def is_amount_field(spec):
+    return spec.get("type") == "number"
+
+
+# Pluggable matchers: (applies(name, spec), extract(name, spec, lines)).
+# The first matcher that applies to a field is used; extract returns
+# (value, confidence) or None when the document is ambiguous.
+LOCAL_EXTRACTORS = [
+    (lambda n, s: s.get("type") == "date" or "yyyy-mm-dd" in s.get("description", "").lower(),
+     extract_date),
+    (lambda n, s: is_amount_field(s) and "subtotal" in n.replace("_", ""),
+     extract_subtotal),
+    (lambda n, s: is_amount_field(s) and n.lower() in ("vat", "gst", "tax", "sales_tax"),
+     extract_tax),
+    (lambda n, s: is_amount_field(s) and "total" in n.lower(),
+     extract_total),
+    (lambda n, s: "currency" in n.lower() or "iso 4217" in s.get("description", "").lower(),
+     extract_currency),
+    (lambda n, s: s.get("type", "string") == "string"
+     and any(k in n.lower() for k in ("reference", "invoice_number", "receipt_number", "order_id")),
+     extract_reference),
+]
+
+
+def pre_extract(schema, document, verbose=False):
+    """Resolve schema fields locally where the document is unambiguous.
+
+    Returns a dict of field name to value for fields extracted with at least
+    PRE_EXTRACT_MIN_CONFIDENCE. Array fields are always left to the model.
+    """
+    lines = [clean_line(line) for line in document.splitlines()]
+    lines = [line for line in lines if line]
+    resolved = {}
+
+    for name, spec in schema["fields"].items():
+        if not isinstance(spec, dict) or spec.get("type") == "array":
+            continue
+        for applies, extract in LOCAL_EXTRACTORS:
+            if not applies(name, spec):
+                continue
+            result = extract(name, spec, lines)
+            if result is not None and result[1] >= PRE_EXTRACT_MIN_CONFIDENCE:
+                resolved[name] = result[0]
+                if verbose:
+                    print(f"Pre-extracted {name}: {result[0]!r}", file=sys.stderr)
+            break
+
+    return resolved
+
+
+def is_required(spec):
+    """Fields are required unless the schema marks them "required": false."""
+    return not (isinstance(spec, dict) and spec.get("required") is False)
+
+
+def subset_schema(schema, field_names):
+    """Return a copy of schema containing only the named fields."""
+    subset = dict(schema)
+    subset["fields"] = {k: v for k, v in schema["fields"].items() if k in field_names}
+    return subset
+
+
+def merge_extraction(schema, local, data):
+    """Merge locally extracted fields into the model's result, in schema order."""
+    def merge(item):
+        if not isinstance(item, dict):
+            return item
+        merged = {}
+        for name in schema["fields"]:
+            if name in local:
+                merged[name] = local[name]
+            elif name in item:
+                merged[name] = item[name]
+        for name, value in item.items():
+            merged.setdefault(name, value)
+        return merged
+
+    if isinstance(data, list):
+        return [merge(item) for item in data]
+    return merge(data)
+
+
 # ============================================================================
 # PROMPT CONSTRUCTION
 # ============================================================================
@@ -139,37 +432,260 @@ Return the extracted data as JSON matching the schema field names."""
 # API CALL
 # ============================================================================
 
-def call_claude(system_prompt, user_prompt, model, verbose=False):
-    """Call Claude API and return the response text."""
-    client = anthropic.Anthropic()
+def call_claude(system_prompt, user_prompt, model, verbose=False, metrics=None):
+    """Call Claude API and return the response text.
+
+    If metrics is a dict (see new_metrics_record), it is filled in with
+    timing, token usage, retry count and outcome for this call.
+    """
+    import anthropic
+
+    # Count HTTP attempts so SDK-internal retries show up in metrics
+    attempts = []
+    http_client = anthropic.DefaultHttpxClient(
+        event_hooks={"request": [lambda request: attempts.append(request.url)]},
+    )
+    client = anthropic.Anthropic(http_client=http_client)
 
     if verbose:
         print(f"Calling {model}...", file=sys.stderr)
 
+    start = time.monotonic()
+    ttfb = None
     try:
-        response = client.messages.create(
+        with client.messages.stream(
             model=model,
             max_tokens=4096,
             system=system_prompt,
             messages=[{"role": "user", "content": user_prompt}],
-        )
-    except anthropic.AuthenticationError:
+        ) as stream:
+            for _ in stream:
+                if ttfb is None:
+                    ttfb = time.monotonic() - start
+            response = stream.get_final_message()
+    except anthropic.AuthenticationError as e:
+        finish_metrics(metrics, start, ttfb, attempts, error=e)
         print("Error: Invalid ANTHROPIC_API_KEY", file=sys.stderr)
         sys.exit(1)
     except anthropic.APIError as e:
+        finish_metrics(metrics, start, ttfb, attempts, error=e)
         print(f"Error: API call failed: {e}", file=sys.stderr)
         sys.exit(1)
 
+    finish_metrics(metrics, start, ttfb, attempts, usage=response.usage)
+
     if verbose:
         usage = response.usage
         print(
             f"Tokens: {usage.input_tokens} input, {usage.output_tokens} output",
             file=sys.stderr,
         )
+        if metrics is not None:
+            cost = metrics["cost_usd"]
+            print(
+                f"Latency: {metrics['latency_ms']:.0f} ms "
+                f"(first byte {metrics['ttfb_ms']:.0f} ms), "
+                f"retries: {metrics['retries']}, "
+                f"est. cost: {'unknown' if cost is None else f'${cost:.6f}'}",
+                file=sys.stderr,
+            )
 
     return response.content[0].text
 
 
+# ============================================================================
+# METRICS
+# ============================================================================
+
+def new_metrics_record(doc_id, model):
+    """Create an empty per-call metrics record."""
+    return {
+        "ts": time.time(),
+        "doc_id": doc_id,
+        "model": model,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cache_read_tokens": 0,
+        "cache_write_tokens": 0,
+        "ttfb_ms": None,
+        "latency_ms": None,
+        "retries": 0,
+        "outcome": None,
+        "error": None,
+        "cost_usd": None,
+        "fields_total": None,
+        "fields_local": 0,
+    }
+
+
+def finish_metrics(metrics, start, ttfb, attempts, usage=None, error=None):
+    """Fill in timing, usage and outcome once a call has completed or failed."""
+    if metrics is None:
+        return
+
+    metrics["latency_ms"] = round((time.monotonic() - start) * 1000, 1)
+    metrics["ttfb_ms"] = None if ttfb is None else round(ttfb * 1000, 1)
+    metrics["retries"] = max(0, len(attempts) - 1)
+
+    if error is not None:
+        metrics["outcome"] = "error"
+        metrics["error"] = type(error).__name__
+        return
+
+    metrics["outcome"] = "ok"
+    metrics["input_tokens"] = usage.input_tokens or 0
+    metrics["output_tokens"] = usage.output_tokens or 0
+    metrics["cache_read_tokens"] = getattr(usage, "cache_read_input_tokens", None) or 0
+    metrics["cache_write_tokens"] = getattr(usage, "cache_creation_input_tokens", None) or 0
+    metrics["cost_usd"] = estimate_cost(metrics)
+
+
+def estimate_cost(metrics):
+    """Estimate USD cost of a call from its token counts, or None if unpriced."""
+    model = metrics["model"]
+    for prefix in sorted(MODEL_PRICING, key=len, reverse=True):
+        if model.startswith(prefix):
+            rate_in, rate_out, rate_write, rate_read = MODEL_PRICING[prefix]
+            break
+    else:
+        return None
+
+    cost = (
+        metrics["input_tokens"] * rate_in
+        + metrics["output_tokens"] * rate_out
+        + metrics["cache_write_tokens"] * rate_write
+        + metrics["cache_read_tokens"] * rate_read
+    ) / 1_000_000
+    return round(cost, 8)
+
+
+def write_metrics(metrics_path, metrics):
+    """Append one metrics record as a JSONL line."""
+    if not metrics_path or metrics is None or metrics["outcome"] is None:
+        return
+    try:
+        with open(metrics_path, "a") as f:
+            f.write(json.dumps(metrics, separators=(",", ":")) + "\n")
+    except OSError as e:
+        print(f"Warning: Cannot write metrics to {metrics_path}: {e}", file=sys.stderr)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize_metrics(metrics_path):
+    """Read a metrics JSONL file and return an aggregate summary dict."""
+    if not os.path.isfile(metrics_path):
+        print(f"Error: Metrics file not found: {metrics_path}", file=sys.stderr)
+        sys.exit(1)
+
+    records = []
+    with open(metrics_path, "r") as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"Warning: Skipping invalid metrics line {line_num}", file=sys.stderr)
+
+    if not records:
+        print(f"Error: No metrics records in: {metrics_path}", file=sys.stderr)
+        sys.exit(1)
+
+    # Documents fully resolved by pre-extraction made no API call
+    calls = [r for r in records if r.get("outcome") != "local"]
+    latencies = sorted(r["latency_ms"] for r in calls if r.get("latency_ms") is not None)
+    ttfbs = sorted(r["ttfb_ms"] for r in calls if r.get("ttfb_ms") is not None)
+    ok = sum(1 for r in calls if r.get("outcome") == "ok")
+    costs = [r["cost_usd"] for r in calls if r.get("cost_usd") is not None]
+
+    # Wall-clock span from the first call's start to the last call's end
+    starts = [r["ts"] for r in records if r.get("ts") is not None]
+    ends = [
+        r["ts"] + (r.get("latency_ms") or 0) / 1000
+        for r in records
+        if r.get("ts") is not None
+    ]
+    span = (max(ends) - min(starts)) if starts and ends else 0
+    output_tokens = sum(r.get("output_tokens") or 0 for r in calls)
+
+    fields_total = sum(r.get("fields_total") or 0 for r in records)
+    fields_local = sum(r.get("fields_local") or 0 for r in records)
+
+    return {
+        "documents": len(records),
+        "calls": len(calls),
+        "ok": ok,
+        "errors": len(calls) - ok,
+        "error_rate": (len(calls) - ok) / len(calls) if calls else 0.0,
+        "retries": sum(r.get("retries") or 0 for r in calls),
+        "latency_ms": {p: percentile(latencies, p) for p in (50, 95, 99)},
+        "ttfb_ms": {p: percentile(ttfbs, p) for p in (50, 95, 99)},
+        "wall_s": span,
+        "docs_per_s": len(records) / span if span > 0 else None,
+        "output_tokens_per_s": output_tokens / span if span > 0 else None,
+        "input_tokens": sum(r.get("input_tokens") or 0 for r in calls),
+        "output_tokens": output_tokens,
+        "cache_read_tokens": sum(r.get("cache_read_tokens") or 0 for r in calls),
+        "cache_write_tokens": sum(r.get("cache_write_tokens") or 0 for r in calls),
+        "cost_usd": sum(costs),
+        "unpriced_calls": sum(
+            1 for r in calls if r.get("outcome") == "ok" and r.get("cost_usd") is None
+        ),
+        "local_docs": len(records) - len(calls),
+        "fields_total": fields_total,
+        "fields_local": fields_local,
+    }
+
+
+def format_summary(summary):
+    """Format a metrics summary as aligned text."""
+    def ms(value):
+        return "-" if value is None else f"{value:.0f} ms"
+
+    def rate(value, unit):
+        return "-" if value is None else f"{value:.2f} {unit}/s"
+
+    def fraction(part, whole):
+        return f"{part}/{whole} ({part / whole:.1%})" if whole else "-"
+
+    rows = [
+        ("documents", str(summary["documents"])),
+        ("api calls", str(summary["calls"])),
+        ("ok", str(summary["ok"])),
+        ("errors", f"{summary['errors']} ({summary['error_rate']:.1%})"),
+        ("retries", str(summary["retries"])),
+        ("latency p50", ms(summary["latency_ms"][50])),
+        ("latency p95", ms(summary["latency_ms"][95])),
+        ("latency p99", ms(summary["latency_ms"][99])),
+        ("ttfb p50", ms(summary["ttfb_ms"][50])),
+        ("ttfb p95", ms(summary["ttfb_ms"][95])),
+        ("ttfb p99", ms(summary["ttfb_ms"][99])),
+        ("wall time", f"{summary['wall_s']:.1f} s"),
+        ("throughput", rate(summary["docs_per_s"], "docs")),
+        ("output rate", rate(summary["output_tokens_per_s"], "tokens")),
+        ("input tokens", str(summary["input_tokens"])),
+        ("output tokens", str(summary["output_tokens"])),
+        ("cache read", str(summary["cache_read_tokens"])),
+        ("cache write", str(summary["cache_write_tokens"])),
+        ("est. cost", f"${summary['cost_usd']:.4f}"),
+        ("local docs", fraction(summary["local_docs"], summary["documents"])),
+        ("local fields", fraction(summary["fields_local"], summary["fields_total"])),
+    ]
+    if summary["unpriced_calls"]:
+        rows.append(("unpriced", f"{summary['unpriced_calls']} calls (unknown model)"))
+
+    width = max(len(k) for k, _ in rows)
+    return "\n".join(f"  {k:<{width}}  {v}" for k, v in rows) + "\n"
+
+
 # ============================================================================
 # JSON EXTRACTION
 # ============================================================================
@@ -195,15 +711,57 @@ def extract_json(response_text):
 # OUTPUT FORMATTING
 # ============================================================================
 
-def format_json(data):
+# Writers stream straight to `out` rather than building the whole output in
+# memory, so extractions with tens of thousands of array items stay cheap.
+
+def cell_text(value):
+    """Render a value for csv/table cells (null as empty)."""
+    return "" if value is None else str(value)
+
+
+def array_headers(items):
+    """Union of keys across all dict items, in first-seen order."""
+    return list({k: None for item in items if isinstance(item, dict) for k in item})
+
+
+def write_json(data, out):
     """Pretty-print JSON output."""
-    return json.dumps(data, indent=2, ensure_ascii=False)
+    json.dump(data, out, indent=2, ensure_ascii=False)
+    out.write("\n")
+
+
+def write_jsonl(data, out):
+    """Write NDJSON: scalar fields on the first line, then one array item per line.
+
+    Each array item carries its field name in "_field" so items from
+    different arrays can be told apart. The scalar line is omitted when there
+    are no scalars, and a top-level array is written as bare items.
+    """
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+    if not isinstance(data, dict):
+        for item in data if isinstance(data, list) else [data]:
+            out.write(dumps(item) + "\n")
+        return
+
+    scalars = {k: v for k, v in data.items() if not isinstance(v, list)}
+    if scalars:
+        out.write(dumps(scalars) + "\n")
+
+    for key, value in data.items():
+        if not isinstance(value, list):
+            continue
+        for item in value:
+            record = {"_field": key}
+            record.update(item if isinstance(item, dict) else {"value": item})
+            out.write(dumps(record) + "\n")
 
 
-def format_csv(data):
-    """Format data as CSV. Scalars as key/value rows, arrays as sections."""
-    output = io.StringIO()
-    writer = csv.writer(output)
+def write_csv(data, out):
+    """Write CSV. Scalars as key/value rows, arrays as sections."""
+    if not isinstance(data, dict):
+        data = {"items": data}
+    writer = csv.writer(out)
 
     for key, value in data.items():
         if isinstance(value, list):
@@ -211,63 +769,65 @@ def format_csv(data):
                 continue
             # Array section: header row + data rows
             writer.writerow([])
-            headers = list(value[0].keys()) if isinstance(value[0], dict) else [key]
+            headers = array_headers(value) or [key]
             writer.writerow(headers)
-            for item in value:
-                if isinstance(item, dict):
-                    writer.writerow([item.get(h, "") for h in headers])
-                else:
-                    writer.writerow([item])
+            writer.writerows(
+                [item.get(h, "") for h in headers] if isinstance(item, dict) else [item]
+                for item in value
+            )
         else:
-            writer.writerow([key, "" if value is None else value])
-
-    return output.getvalue()
+            writer.writerow([key, cell_text(value)])
 
 
-def format_table(data):
-    """Format data as an aligned text table."""
-    lines = []
+def write_table(data, out):
+    """Write data as an aligned text table."""
+    if not isinstance(data, dict):
+        data = {"items": data}
 
     # Scalar fields
     scalar_items = [(k, v) for k, v in data.items() if not isinstance(v, list)]
     if scalar_items:
         max_key_len = max(len(k) for k, _ in scalar_items)
         for key, value in scalar_items:
-            display_val = "" if value is None else str(value)
-            lines.append(f"  {key:<{max_key_len}}  {display_val}")
+            out.write(f"  {key:<{max_key_len}}  {cell_text(value)}\n")
 
     # Array fields
     for key, value in data.items():
         if not isinstance(value, list) or not value:
             continue
 
-        lines.append("")
-        lines.append(f"  {key}:")
+        out.write(f"\n  {key}:\n")
 
-        if isinstance(value[0], dict):
-            headers = list(value[0].keys())
-            col_widths = {h: len(h) for h in headers}
+        headers = array_headers(value)
+        if not headers:
             for item in value:
-                for h in headers:
-                    val_str = str(item.get(h, ""))
-                    if len(val_str) > col_widths[h]:
-                        col_widths[h] = len(val_str)
+                out.write(f"    - {item}\n")
+            continue
 
-            header_line = "  ".join(h.ljust(col_widths[h]) for h in headers)
-            sep_line = "  ".join("-" * col_widths[h] for h in headers)
-            lines.append(f"    {header_line}")
-            lines.append(f"    {sep_line}")
+        # Render every cell to text once. Cells are kept column-wise: a few
+        # long lists of strings avoid the GC churn of one list per row.
+        if not all(isinstance(item, dict) for item in value):
+            value = [item if isinstance(item, dict) else {headers[0]: item} for item in value]
+        columns = [
+            ["" if v is None else str(v) for v in [item.get(h) for item in value]]
+            for h in headers
+        ]
+        widths = [max(len(h), max(map(len, column))) for h, column in zip(headers, columns)]
+
+        out.write("    " + "  ".join(map(str.ljust, headers, widths)) + "\n")
+        out.write("    " + "  ".join("-" * w for w in widths) + "\n")
+        out.writelines(
+            "    " + "  ".join(map(str.ljust, row, widths)) + "\n"
+            for row in zip(*columns)
+        )
 
-            for item in value:
-                row = "  ".join(
-                    str(item.get(h, "")).ljust(col_widths[h]) for h in headers
-                )
-                lines.append(f"    {row}")
-        else:
-            for item in value:
-                lines.append(f"    - {item}")
 
-    return "\n".join(lines) + "\n"
+WRITERS = {
+    "json": write_json,
+    "jsonl": write_jsonl,
+    "csv": write_csv,
+    "table": write_table,
+}
 
 
 # ============================================================================
@@ -284,12 +844,12 @@ def main():
         help="Path to input document (.md, .txt, or .pdf). Reads stdin if omitted",
     )
     parser.add_argument(
-        "--schema", required=True,
+        "--schema",
         help="JSON schema template describing what to extract",
     )
     parser.add_argument(
         "--format", dest="fmt", default="json",
-        choices=["json", "csv", "table"],
+        choices=list(WRITERS),
         help="Output format (default: json)",
     )
     parser.add_argument(
@@ -300,32 +860,83 @@ def main():
         "--verbose", action="store_true",
         help="Show progress and token usage to stderr",
     )
+    parser.add_argument(
+        "--pre-extract", action="store_true",
+        help="Resolve unambiguous fields locally; skip the API if all are found",
+    )
+    parser.add_argument(
+        "--metrics", metavar="FILE",
+        help="Append one JSONL record per API call to FILE",
+    )
+    parser.add_argument(
+        "--doc-id",
+        help="Document ID for metrics records (default: input file path)",
+    )
+    parser.add_argument(
+        "--metrics-summary", metavar="FILE",
+        help="Summarise a metrics JSONL file and exit",
+    )
 
     args = parser.parse_args()
 
+    # Summary mode: no schema, document or API call needed
+    if args.metrics_summary:
+        sys.stdout.write(format_summary(summarize_metrics(args.metrics_summary)))
+        return
+
+    if not args.schema:
+        parser.error("the following arguments are required: --schema")
+
     # Load schema
     schema = load_schema(args.schema)
 
     # Read document
     document = read_document(args.file, verbose=args.verbose)
 
-    # Build prompts
-    system_prompt = build_system_prompt()
-    user_prompt = build_user_prompt(schema, document)
+    # Resolve unambiguous fields locally before calling the model
+    local = pre_extract(schema, document, verbose=args.verbose) if args.pre_extract else {}
+    missing = [name for name in schema["fields"] if name not in local]
+    missing_required = [name for name in missing if is_required(schema["fields"][name])]
 
-    # Call Claude
-    response_text = call_claude(system_prompt, user_prompt, args.model, verbose=args.verbose)
+    metrics = new_metrics_record(args.doc_id or args.file or "-", args.model)
+    metrics["fields_total"] = len(schema["fields"])
+    metrics["fields_local"] = len(local)
 
-    # Parse JSON
-    data = extract_json(response_text)
+    if args.pre_extract and args.verbose:
+        print(
+            f"Resolved {len(local)}/{len(schema['fields'])} fields locally",
+            file=sys.stderr,
+        )
+
+    if local and not missing_required:
+        # Every required field resolved locally: no API call needed
+        if args.verbose:
+            print("Skipping API call: all required fields resolved locally", file=sys.stderr)
+        metrics["outcome"] = "local"
+        write_metrics(args.metrics, metrics)
+        data = merge_extraction(schema, local, {name: None for name in missing})
+    else:
+        # Build prompts, asking only for the fields still missing
+        request_schema = subset_schema(schema, missing) if local else schema
+        system_prompt = build_system_prompt()
+        user_prompt = build_user_prompt(request_schema, document)
+
+        # Call Claude, recording metrics even if the call fails
+        try:
+            response_text = call_claude(
+                system_prompt, user_prompt, args.model,
+                verbose=args.verbose, metrics=metrics,
+            )
+        finally:
+            write_metrics(args.metrics, metrics)
+
+        # Parse JSON
+        data = extract_json(response_text)
+        if local:
+            data = merge_extraction(schema, local, data)
 
     # Format and output
-    if args.fmt == "json":
-        print(format_json(data))
-    elif args.fmt == "csv":
-        sys.stdout.write(format_csv(data))
-    elif args.fmt == "table":
-        sys.stdout.write(format_table(data))
+    WRITERS[args.fmt](data, sys.stdout)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+bench_format - Benchmark xtrct output writers on a large synthetic result
+
+Builds a bank-statement-like extraction with many line items (some rows
+missing columns, some with extra ones) and times each --format writer
+against a null sink. Reports best-of-N time, rows per second and peak
+Python memory allocated while writing.
+
+Run with the xtrct venv so lib/xtrct.py imports cleanly:
+
+  opt/xtrct/lib/.venv/bin/python opt/xtrct/test/bench_format.py --rows 50000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(TEST_DIR, "..", "lib"))
+
+import xtrct  # noqa: E402
+
+
+def make_result(rows, seed=0):
+    """Synthetic statement: a few scalars plus `rows` transactions."""
+    rng = random.Random(seed)
+    transactions = []
+    balance = 10_000.0
+    for i in range(rows):
+        amount = round(rng.uniform(-500, 500), 2)
+        balance = round(balance + amount, 2)
+        item = {
+            "date": f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            "description": f"Card payment to merchant {rng.randint(1, 5000)}",
+            "amount": amount,
+            "balance": balance,
+        }
+        # Ragged columns: some rows lack a field, some add one
+        if i % 7 == 0:
+            del item["balance"]
+        if i % 11 == 0:
+            item["reference"] = f"REF{i:08d}"
+        transactions.append(item)
+
+    return {
+        "bank": "Example Bank plc",
+        "account_number": "12345678",
+        "statement_date": "2026-12-31",
+        "opening_balance": 10_000.0,
+        "closing_balance": balance,
+        "transactions": transactions,
+    }
+
+
+def bench(writer, data, repeat):
+    """Return (best seconds, peak bytes) for writing data to a null sink."""
+    with open(os.devnull, "w") as sink:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            writer(data, sink)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        tracemalloc.start()
+        writer(data, sink)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="bench_format",
+        description="Benchmark xtrct output writers on a large synthetic result",
+    )
+    parser.add_argument("--rows", type=int, default=50000, help="Array items (default: 50000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per format (default: 3)")
+    parser.add_argument("--formats", default=",".join(xtrct.WRITERS),
+                        help="Comma-separated formats (default: all)")
+    args = parser.parse_args()
+
+    data = make_result(args.rows)
+    formats = [f for f in args.formats.split(",") if f]
+    unknown = [f for f in formats if f not in xtrct.WRITERS]
+    if unknown:
+        print(f"Error: Unknown format: {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    print(f"  {'format':<6}  {'seconds':>8}  {'rows/s':>10}  {'peak MiB':>8}")
+    for fmt in formats:
+        seconds, peak = bench(xtrct.WRITERS[fmt], data, args.repeat)
+        rate = args.rows / seconds if seconds > 0 else float("inf")
+        print(f"  {fmt:<6}  {seconds:>8.3f}  {rate:>10.0f}  {peak / 2**20:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
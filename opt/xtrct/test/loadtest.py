@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+loadtest - Throughput load-test harness for xtrct
+
+Starts the local mock Messages server (mock_api.py), generates synthetic
+documents of the requested sizes, and drives xtrct against the mock at each
+concurrency level. Reports documents per second plus end-to-end and per-call
+latency percentiles (the latter from xtrct --metrics).
+
+Runs entirely offline. Example:
+
+  python3 loadtest.py --concurrency 1,4,16 --sizes 2000,20000 --docs 32 \\
+      --latency lognormal:400,0.5 --overload 0.02
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, TEST_DIR)
+sys.path.insert(0, os.path.join(TEST_DIR, "..", "lib"))
+
+import mock_api  # noqa: E402
+from xtrct import percentile  # noqa: E402  (stdlib-only at import time)
+
+
+FIXTURES_DIR = os.path.join(TEST_DIR, "fixtures")
+UTILZ_HOME = os.environ.get("UTILZ_HOME") or os.path.abspath(os.path.join(TEST_DIR, "../../.."))
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def parse_int_list(value):
+    try:
+        return [int(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated integers: {value}")
+
+
+def make_document(path, size):
+    """Write a synthetic document of roughly `size` chars based on sample.md."""
+    with open(os.path.join(FIXTURES_DIR, "sample.md"), "r") as f:
+        base = f.read()
+    filler = "| Labour and materials | 1 | 10.00 | 10.00 |\n"
+    body = base
+    while len(body) < size:
+        body += filler
+    with open(path, "w") as f:
+        f.write(body[:max(size, len(base))])
+
+
+def run_one(xtrct, doc, schema, metrics_path, env):
+    """Run xtrct once. Returns (elapsed seconds, exit code)."""
+    start = time.monotonic()
+    result = subprocess.run(
+        [xtrct, doc, "--schema", schema, "--metrics", metrics_path],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=env,
+    )
+    return time.monotonic() - start, result.returncode
+
+
+def read_call_latencies(metrics_path):
+    """Return sorted per-call latencies (ms) from an xtrct metrics file."""
+    if not os.path.isfile(metrics_path):
+        return []
+    latencies = []
+    with open(metrics_path, "r") as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get("latency_ms") is not None:
+                latencies.append(record["latency_ms"])
+    return sorted(latencies)
+
+
+# ============================================================================
+# LOAD TEST
+# ============================================================================
+
+def run_level(xtrct, doc, schema, concurrency, docs, env, workdir):
+    """Drive `docs` extractions at the given concurrency. Returns a result dict."""
+    metrics_path = os.path.join(workdir, f"metrics-c{concurrency}-{os.path.basename(doc)}.jsonl")
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(
+            lambda _: run_one(xtrct, doc, schema, metrics_path, env),
+            range(docs),
+        ))
+    wall = time.monotonic() - start
+
+    elapsed = sorted(r[0] * 1000 for r in results)
+    calls = read_call_latencies(metrics_path)
+    return {
+        "concurrency": concurrency,
+        "doc_chars": os.path.getsize(doc),
+        "docs": docs,
+        "errors": sum(1 for r in results if r[1] != 0),
+        "wall_s": round(wall, 3),
+        "docs_per_s": round(docs / wall, 2) if wall > 0 else None,
+        "e2e_ms": {str(p): round(percentile(elapsed, p), 1) for p in (50, 95, 99)},
+        "call_ms": {
+            str(p): None if not calls else round(percentile(calls, p), 1)
+            for p in (50, 95, 99)
+        },
+    }
+
+
+def format_results(results):
+    """Format load-test results as an aligned text table."""
+    headers = ["conc", "chars", "docs", "errors", "docs/s",
+               "e2e p50", "e2e p95", "e2e p99", "call p50", "call p95", "call p99"]
+
+    def ms(value):
+        return "-" if value is None else f"{value:.0f}"
+
+    rows = [[
+        str(r["concurrency"]), str(r["doc_chars"]), str(r["docs"]), str(r["errors"]),
+        "-" if r["docs_per_s"] is None else f"{r['docs_per_s']:.2f}",
+        ms(r["e2e_ms"]["50"]), ms(r["e2e_ms"]["95"]), ms(r["e2e_ms"]["99"]),
+        ms(r["call_ms"]["50"]), ms(r["call_ms"]["95"]), ms(r["call_ms"]["99"]),
+    ] for r in results]
+
+    widths = [max(len(h), *(len(row[i]) for row in rows)) for i, h in enumerate(headers)]
+    lines = ["  ".join(h.rjust(w) for h, w in zip(headers, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    lines.extend("  ".join(c.rjust(w) for c, w in zip(row, widths)) for row in rows)
+    return "\n".join(lines) + "\n(latencies in ms)\n"
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="loadtest",
+        description="Drive xtrct against the local mock API and report throughput",
+    )
+    parser.add_argument("--concurrency", type=parse_int_list, default=[1, 4],
+                        help="Comma-separated worker counts (default: 1,4)")
+    parser.add_argument("--sizes", type=parse_int_list, default=[2000],
+                        help="Comma-separated document sizes in chars (default: 2000)")
+    parser.add_argument("--docs", type=int, default=8,
+                        help="Documents per concurrency/size level (default: 8)")
+    parser.add_argument("--xtrct", default=os.path.join(UTILZ_HOME, "bin", "xtrct"),
+                        help="xtrct executable (default: $UTILZ_HOME/bin/xtrct)")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    parser.add_argument("--min-docs-per-s", type=float, default=None,
+                        help="Exit non-zero if any level falls below this throughput")
+    mock_api.add_server_arguments(parser)
+    parser.set_defaults(schema=None)
+
+    args = parser.parse_args()
+    schema = os.path.join(FIXTURES_DIR, "sample_schema.json")
+
+    server, state = mock_api.start_server(args)
+    host, port = server.server_address[:2]
+
+    env = dict(os.environ)
+    env["ANTHROPIC_BASE_URL"] = f"http://{host}:{port}"
+    env["ANTHROPIC_API_KEY"] = env.get("ANTHROPIC_API_KEY") or "mock-key"
+    env["UTILZ_HOME"] = UTILZ_HOME
+
+    results = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="xtrct-loadtest-") as workdir:
+            for size in args.sizes:
+                doc = os.path.join(workdir, f"doc-{size}.md")
+                make_document(doc, size)
+                # Warm-up run so venv creation is not counted
+                run_one(args.xtrct, doc, schema, os.path.join(workdir, "warmup.jsonl"), env)
+                for concurrency in args.concurrency:
+                    if args.verbose:
+                        print(f"Running {args.docs} docs of {size} chars at concurrency {concurrency}...",
+                              file=sys.stderr)
+                    results.append(run_level(args.xtrct, doc, schema, concurrency, args.docs, env, workdir))
+    finally:
+        server.shutdown()
+
+    if args.json:
+        print(json.dumps({"results": results, "server": state.counts}, indent=2))
+    else:
+        sys.stdout.write(format_results(results))
+        print(f"mock server: {json.dumps(state.counts)}")
+
+    if args.min_docs_per_s is not None:
+        slow = [r for r in results if (r["docs_per_s"] or 0) < args.min_docs_per_s]
+        for r in slow:
+            print(
+                f"Error: {r['docs_per_s']} docs/s at concurrency {r['concurrency']}, "
+                f"{r['doc_chars']} chars is below {args.min_docs_per_s}",
+                file=sys.stderr,
+            )
+        if slow:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+mock_api - Local stand-in for the Anthropic Messages endpoint
+
+Serves POST /v1/messages with canned extraction replies so xtrct's API client
+path can be exercised and benchmarked without network access. Point xtrct at
+it with ANTHROPIC_BASE_URL=http://127.0.0.1:<port>.
+
+Replies are derived from the schema: by default the field definitions are read
+from the ```json block xtrct embeds in the user prompt, or from --schema. Each
+field gets a plausible value for its type.
+
+Supports:
+  - Configurable latency before the first byte (fixed/uniform/normal/lognormal)
+  - Streaming (SSE) and non-streaming replies, with per-chunk delay
+  - Rate-limit (429) and overload (529) error injection with retry-after
+  - Stdlib only, so it runs with the system python3
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# ============================================================================
+# LATENCY DISTRIBUTIONS
+# ============================================================================
+
+def parse_latency(spec):
+    """Parse a latency spec into a callable returning seconds.
+
+    Formats (milliseconds):
+      fixed:MS
+      uniform:LO,HI
+      normal:MEAN,SD
+      lognormal:MEDIAN,SIGMA
+    """
+    try:
+        kind, _, params = spec.partition(":")
+        values = [float(v) for v in params.split(",")] if params else []
+        if kind == "fixed" and len(values) == 1:
+            ms = values[0]
+            sample = lambda rng: ms
+        elif kind == "uniform" and len(values) == 2:
+            lo, hi = values
+            sample = lambda rng: rng.uniform(lo, hi)
+        elif kind == "normal" and len(values) == 2:
+            mean, sd = values
+            sample = lambda rng: rng.gauss(mean, sd)
+        elif kind == "lognormal" and len(values) == 2:
+            mu, sigma = math.log(values[0]), values[1]
+            sample = lambda rng: rng.lognormvariate(mu, sigma)
+        else:
+            raise ValueError(spec)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid latency spec: {spec} "
+            "(use fixed:MS, uniform:LO,HI, normal:MEAN,SD or lognormal:MEDIAN,SIGMA)"
+        )
+    return lambda rng: max(0.0, sample(rng)) / 1000
+
+
+# ============================================================================
+# CANNED REPLIES
+# ============================================================================
+
+def sample_value(name, spec, index=0):
+    """Return a plausible value for a schema field definition."""
+    field_type = spec.get("type", "string") if isinstance(spec, dict) else "string"
+    description = spec.get("description", "").lower() if isinstance(spec, dict) else ""
+
+    if field_type == "array":
+        items = spec.get("items", {})
+        if isinstance(items, dict) and items and all(isinstance(v, dict) for v in items.values()):
+            return [
+                {k: sample_value(k, v, i) for k, v in items.items()}
+                for i in range(2)
+            ]
+        return [f"{name} {i + 1}" for i in range(2)]
+    if field_type == "number":
+        return round(100 + 23.45 * (index + 1), 2)
+    if field_type == "boolean":
+        return True
+    if field_type == "date" or "yyyy-mm-dd" in description:
+        return f"2026-01-{index + 1:02d}"
+    if "iso 4217" in description or "currency" in name:
+        return "GBP"
+    return f"Sample {name.replace('_', ' ')}"
+
+
+def fields_from_prompt(prompt):
+    """Recover schema fields from the first ```json block of an xtrct prompt."""
+    match = re.search(r"```json\s*\n(.*?)```", prompt, re.DOTALL)
+    if not match:
+        return {}
+    try:
+        fields = json.loads(match.group(1))
+    except json.JSONDecodeError:
+        return {}
+    return fields if isinstance(fields, dict) else {}
+
+
+def build_reply_text(fields):
+    """Build the fenced JSON reply xtrct expects."""
+    data = {name: sample_value(name, spec) for name, spec in fields.items()}
+    return "```json\n" + json.dumps(data, indent=2) + "\n```"
+
+
+def prompt_text(body):
+    """Concatenate the text of all user message content."""
+    parts = []
+    for message in body.get("messages", []):
+        content = message.get("content", "")
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(c.get("text", "") for c in content if isinstance(c, dict))
+    return "\n".join(parts)
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+class MockState:
+    """Shared configuration, RNG and counters for all handler threads."""
+
+    def __init__(self, args):
+        self.args = args
+        self.schema_fields = None
+        if args.schema:
+            with open(args.schema, "r") as f:
+                self.schema_fields = json.load(f).get("fields", {})
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "ok": 0, "rate_limited": 0, "overloaded": 0}
+
+    def draw(self):
+        """Draw latency and error injection for one request."""
+        with self.lock:
+            self.counts["requests"] += 1
+            latency = self.args.latency(self.rng)
+            roll = self.rng.random()
+        if roll < self.args.rate_limit:
+            return latency, 429
+        if roll < self.args.rate_limit + self.args.overload:
+            return latency, 529
+        return latency, 200
+
+    def count(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+
+class MessagesHandler(BaseHTTPRequestHandler):
+    """Handle POST /v1/messages like the Messages API."""
+
+    protocol_version = "HTTP/1.1"
+    state = None
+
+    def log_message(self, fmt, *args):
+        if self.state.args.verbose:
+            sys.stderr.write("mock_api: " + (fmt % args) + "\n")
+
+    def do_POST(self):
+        length = int(self.headers.get("content-length", 0))
+        raw = self.rfile.read(length)
+
+        if self.path.split("?")[0] != "/v1/messages":
+            self.send_json(404, error_body("not_found_error", f"Unknown path: {self.path}"))
+            return
+
+        try:
+            body = json.loads(raw)
+        except json.JSONDecodeError:
+            self.send_json(400, error_body("invalid_request_error", "Invalid JSON body"))
+            return
+
+        latency, status = self.state.draw()
+        time.sleep(latency)
+
+        if status == 429:
+            self.state.count("rate_limited")
+            self.send_json(429, error_body("rate_limit_error", "Injected rate limit"), retry=True)
+            return
+        if status == 529:
+            self.state.count("overloaded")
+            self.send_json(529, error_body("overloaded_error", "Injected overload"), retry=True)
+            return
+
+        prompt = prompt_text(body)
+        fields = self.state.schema_fields
+        if fields is None:
+            fields = fields_from_prompt(prompt)
+        text = build_reply_text(fields)
+        usage = {
+            "input_tokens": max(1, (len(prompt) + len(str(body.get("system", "")))) // 4),
+            "output_tokens": max(1, len(text) // 4),
+        }
+        model = body.get("model", "mock")
+
+        if body.get("stream"):
+            self.send_stream(model, text, usage)
+        else:
+            self.send_json(200, {
+                "id": "msg_mock",
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": usage,
+            })
+        self.state.count("ok")
+
+    def send_json(self, status, payload, retry=False):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        if retry:
+            retry_ms = self.state.args.retry_after_ms
+            self.send_header("retry-after-ms", str(retry_ms))
+            self.send_header("retry-after", str(max(0, round(retry_ms / 1000))))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_stream(self, model, text, usage):
+        self.send_response(200)
+        self.send_header("content-type", "text/event-stream")
+        self.send_header("cache-control", "no-cache")
+        self.send_header("connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        chunk = max(1, self.state.args.chunk_size)
+        delay = self.state.args.chunk_delay / 1000
+
+        self.send_event("message_start", {
+            "type": "message_start",
+            "message": {
+                "id": "msg_mock", "type": "message", "role": "assistant",
+                "model": model, "content": [], "stop_reason": None,
+                "stop_sequence": None,
+                "usage": {"input_tokens": usage["input_tokens"], "output_tokens": 1},
+            },
+        })
+        self.send_event("content_block_start", {
+            "type": "content_block_start", "index": 0,
+            "content_block": {"type": "text", "text": ""},
+        })
+        for i in range(0, len(text), chunk):
+            if delay and i:
+                time.sleep(delay)
+            self.send_event("content_block_delta", {
+                "type": "content_block_delta", "index": 0,
+                "delta": {"type": "text_delta", "text": text[i:i + chunk]},
+            })
+        self.send_event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        self.send_event("message_delta", {
+            "type": "message_delta",
+            "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+            "usage": {"output_tokens": usage["output_tokens"]},
+        })
+        self.send_event("message_stop", {"type": "message_stop"})
+
+    def send_event(self, event, data):
+        self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode())
+        self.wfile.flush()
+
+
+def error_body(error_type, message):
+    return {"type": "error", "error": {"type": error_type, "message": message}}
+
+
+def start_server(args):
+    """Start the mock server in a background thread. Returns (server, state)."""
+    state = MockState(args)
+    handler = type("Handler", (MessagesHandler,), {"state": state})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, state
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="mock_api",
+        description="Local stand-in for the Anthropic Messages endpoint",
+    )
+    add_server_arguments(parser)
+    return parser
+
+
+def add_server_arguments(parser):
+    """Register mock server options (shared with the load-test harness)."""
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=0, help="Port (default: 0 picks a free port)")
+    parser.add_argument(
+        "--latency", type=parse_latency, default=parse_latency("fixed:0"),
+        help="Latency before first byte: fixed:MS, uniform:LO,HI, normal:MEAN,SD, "
+             "lognormal:MEDIAN,SIGMA (default: fixed:0)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=16, help="Characters per streamed delta (default: 16)")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="Milliseconds between streamed deltas (default: 0)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Fraction of requests answered with 429 (default: 0)")
+    parser.add_argument("--overload", type=float, default=0.0, help="Fraction of requests answered with 529 (default: 0)")
+    parser.add_argument("--retry-after-ms", type=int, default=100, help="retry-after hint on injected errors (default: 100)")
+    parser.add_argument("--schema", help="Build replies from this schema instead of the prompt")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for latency and error injection")
+    parser.add_argument("--verbose", action="store_true", help="Log requests to stderr")
+
+
+def main():
+    args = build_parser().parse_args()
+    server, state = start_server(args)
+    host, port = server.server_address[:2]
+
+    # First stdout line is the base URL, so callers using --port 0 can find us
+    print(f"http://{host}:{port}", flush=True)
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        print(f"mock_api: {json.dumps(state.counts)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,25 @@ run_xtrct() {
 }
 
 FIXTURES_DIR="$UTILZ_HOME/opt/xtrct/test/fixtures"
+MOCK_API="$UTILZ_HOME/opt/xtrct/test/mock_api.py"
+
+# Start the local mock Messages server; sets MOCK_URL and MOCK_PID
+start_mock_api() {
+  local url_file="$BATS_TEST_TMPDIR/mock_url"
+  python3 "$MOCK_API" "$@" > "$url_file" 2>/dev/null &
+  MOCK_PID=$!
+  local i
+  for i in $(seq 1 50); do
+    [[ -s "$url_file" ]] && break
+    sleep 0.1
+  done
+  MOCK_URL=$(head -1 "$url_file")
+  [[ -n "$MOCK_URL" ]] || fail "mock API server did not start"
+}
+
+stop_mock_api() {
+  [[ -n "${MOCK_PID:-}" ]] && kill "$MOCK_PID" 2>/dev/null || true
+}
 
 # ============================================================================
 # TIER 1: ALWAYS RUN (no API key required)
@@ -70,6 +89,186 @@ FIXTURES_DIR="$UTILZ_HOME/opt/xtrct/test/fixtures"
   assert_output_contains "pdf2md"
 }
 
+@test "xtrct --metrics-summary reports latency percentiles without API key" {
+  require_command python3 "python3 required"
+  unset ANTHROPIC_API_KEY
+  run_xtrct --metrics-summary "$FIXTURES_DIR/sample_metrics.jsonl"
+  assert_success
+  assert_output_contains "latency p95"
+  assert_output_contains "9000 ms"
+  assert_output_contains "1 (25.0%)"
+}
+
+@test "xtrct --metrics-summary totals tokens and cost" {
+  require_command python3 "python3 required"
+  run_xtrct --metrics-summary "$FIXTURES_DIR/sample_metrics.jsonl"
+  assert_success
+  assert_output_contains "3600"
+  assert_output_contains "\$0.0058"
+}
+
+@test "xtrct --metrics-summary with nonexistent file shows error" {
+  require_command python3 "python3 required"
+  run_xtrct --metrics-summary /tmp/nonexistent_metrics_12345.jsonl
+  assert_failure
+  assert_output_contains "not found"
+}
+
+@test "xtrct --pre-extract skips API when required fields resolve locally" {
+  require_command python3 "python3 required"
+  local metrics="$BATS_TEST_TMPDIR/metrics.jsonl"
+  # Dummy key: any real API call would fail
+  ANTHROPIC_API_KEY=test run_xtrct "$FIXTURES_DIR/receipt.md" \
+    --schema "$FIXTURES_DIR/receipt_schema.json" --pre-extract --metrics "$metrics"
+  assert_success
+  assert_output_contains '"date": "2026-03-03"'
+  assert_output_contains '"currency": "GBP"'
+  assert_output_contains '"total": 9.7'
+  assert_output_contains '"reference": "R-20481"'
+  run jq -r '"\(.outcome) \(.fields_local)/\(.fields_total)"' "$metrics"
+  assert_output "local 6/6"
+}
+
+@test "xtrct --pre-extract takes the total, not the included VAT, from one line" {
+  require_command python3 "python3 required"
+  cat > "$BATS_TEST_TMPDIR/receipt.md" <<'DOC'
+Date: 3 March 2026
+Total: £123.45 (incl. VAT £20.58)
+DOC
+  cat > "$BATS_TEST_TMPDIR/schema.json" <<'JSON'
+{"fields": {"date": {"type": "string", "description": "Date as YYYY-MM-DD"},
+            "total": {"type": "number", "description": "Total including VAT"}}}
+JSON
+  ANTHROPIC_API_KEY=test run_xtrct "$BATS_TEST_TMPDIR/receipt.md" \
+    --schema "$BATS_TEST_TMPDIR/schema.json" --pre-extract
+  assert_success
+  assert_output_contains '"total": 123.45'
+}
+
+@test "xtrct --pre-extract does not take a count or savings as the total" {
+  require_command python3 "python3 required"
+  cat > "$BATS_TEST_TMPDIR/schema.json" <<'JSON'
+{"fields": {"date": {"type": "string", "description": "Date as YYYY-MM-DD"},
+            "total": {"type": "number", "description": "Total paid", "required": false}}}
+JSON
+  printf 'Date: 2026-01-05\nTotal items: 3\nAmount due 45.00 GBP\n' > "$BATS_TEST_TMPDIR/items.md"
+  printf 'Date: 2026-01-05\nTotal savings: £2.00\n' > "$BATS_TEST_TMPDIR/savings.md"
+
+  # total is optional, so an unresolved total is null and no API call is made
+  local doc
+  for doc in items savings; do
+    ANTHROPIC_API_KEY=test run_xtrct "$BATS_TEST_TMPDIR/$doc.md" \
+      --schema "$BATS_TEST_TMPDIR/schema.json" --pre-extract
+    assert_success
+    assert_output_contains '"total": null'
+  done
+}
+
+@test "xtrct --metrics-summary reports locally resolved documents and fields" {
+  require_command python3 "python3 required"
+  run_xtrct --metrics-summary "$FIXTURES_DIR/sample_metrics.jsonl"
+  assert_success
+  assert_output_contains "1/5 (20.0%)"
+  assert_output_contains "11/40 (27.5%)"
+}
+
+@test "xtrct starts within the default ceiling without importing anthropic" {
+  require_command python3 "python3 required"
+  # Default --max-ttfb-ms ceiling; also fails if any trivial invocation imports anthropic
+  run python3 "$UTILZ_HOME/opt/utilz/test/bench_startup.py" --tools xtrct --runs 3
+  assert_success
+  assert_output_contains "eager heavy imports: none"
+  refute_output_contains "exceeds"
+}
+
+# ============================================================================
+# TIER 1b: LOCAL MOCK API (python3 required, no network)
+# ============================================================================
+
+@test "xtrct extracts schema fields from mock API" {
+  require_command python3 "python3 required"
+  start_mock_api
+  ANTHROPIC_API_KEY=mock ANTHROPIC_BASE_URL="$MOCK_URL" \
+    run_xtrct "$FIXTURES_DIR/sample.md" --schema "$FIXTURES_DIR/sample_schema.json"
+  stop_mock_api
+  assert_success
+  assert_output_contains "supplier_name"
+  assert_output_contains "line_items"
+}
+
+@test "xtrct retries injected overload errors from mock API" {
+  require_command python3 "python3 required"
+  start_mock_api --overload 0.5 --seed 3 --retry-after-ms 10
+  local metrics="$BATS_TEST_TMPDIR/metrics.jsonl"
+  ANTHROPIC_API_KEY=mock ANTHROPIC_BASE_URL="$MOCK_URL" \
+    run_xtrct "$FIXTURES_DIR/sample.md" --schema "$FIXTURES_DIR/sample_schema.json" --metrics "$metrics"
+  stop_mock_api
+  assert_success
+  run jq -r '"\(.outcome) \(.retries)"' "$metrics"
+  assert_output "ok 1"
+}
+
+@test "xtrct --format jsonl writes scalars then one line per array item" {
+  require_command python3 "python3 required"
+  start_mock_api
+  ANTHROPIC_API_KEY=mock ANTHROPIC_BASE_URL="$MOCK_URL" \
+    run_xtrct "$FIXTURES_DIR/sample.md" --schema "$FIXTURES_DIR/sample_schema.json" --format jsonl
+  stop_mock_api
+  assert_success
+  [[ "${#lines[@]}" -eq 3 ]] || fail "Expected 3 lines, got ${#lines[@]}"
+  [[ "${lines[0]}" == *'"supplier_name"'* ]] || fail "First line should hold scalar fields"
+  [[ "${lines[1]}" == *'"_field":"line_items"'*'"amount"'* ]] || fail "Second line should be a tagged line item"
+}
+
+@test "xtrct jsonl writer tags items from each array and skips empty scalars" {
+  require_command python3 "python3 required"
+  run python3 -c '
+import io, sys
+sys.path.insert(0, sys.argv[1])
+from xtrct import write_jsonl
+for data in ({"line_items": [{"x": 1}], "payments": [{"x": 2}]}, [{"x": 3}]):
+    out = io.StringIO()
+    write_jsonl(data, out)
+    sys.stdout.write(out.getvalue())
+' "$UTILZ_HOME/opt/xtrct/lib"
+  assert_success
+  assert_output '{"_field":"line_items","x":1}
+{"_field":"payments","x":2}
+{"x":3}'
+}
+
+@test "xtrct --format csv writes array section headers against mock API" {
+  require_command python3 "python3 required"
+  start_mock_api
+  ANTHROPIC_API_KEY=mock ANTHROPIC_BASE_URL="$MOCK_URL" \
+    run_xtrct "$FIXTURES_DIR/sample.md" --schema "$FIXTURES_DIR/sample_schema.json" --format csv
+  stop_mock_api
+  assert_success
+  assert_output_contains "description,quantity,unit_price,amount"
+}
+
+@test "xtrct --pre-extract keeps local fields and asks mock API for the rest" {
+  require_command python3 "python3 required"
+  start_mock_api
+  ANTHROPIC_API_KEY=mock ANTHROPIC_BASE_URL="$MOCK_URL" \
+    run_xtrct "$FIXTURES_DIR/sample.md" --schema "$FIXTURES_DIR/sample_schema.json" --pre-extract
+  stop_mock_api
+  assert_success
+  # Local values win over the mock's canned ones
+  assert_output_contains '"invoice_number": "INV-2153"'
+  assert_output_contains '"total": 1535.43'
+  # Missing fields still come from the API
+  assert_output_contains '"supplier_name": "Sample supplier name"'
+}
+
+@test "loadtest reports docs per second against mock API" {
+  require_command python3 "python3 required"
+  run python3 "$UTILZ_HOME/opt/xtrct/test/loadtest.py" --concurrency 1,2 --sizes 1000 --docs 2
+  assert_success
+  assert_output_contains "docs/s"
+  assert_output_contains "call p95"
+}
+
 # ============================================================================
 # TIER 2: REQUIRE ANTHROPIC_API_KEY (skipped in CI)
 # ============================================================================
@@ -107,3 +306,14 @@ FIXTURES_DIR="$UTILZ_HOME/opt/xtrct/test/fixtures"
   assert_success
   assert_output_contains "supplier_name"
 }
+
+@test "xtrct --metrics appends a JSONL record per call" {
+  [[ -z "${ANTHROPIC_API_KEY:-}" ]] && skip "ANTHROPIC_API_KEY not set"
+  require_command python3 "python3 required"
+  local metrics="$BATS_TEST_TMPDIR/metrics.jsonl"
+  run_xtrct "$FIXTURES_DIR/sample.md" --schema "$FIXTURES_DIR/sample_schema.json" --metrics "$metrics"
+  assert_success
+  run jq -r '.outcome' "$metrics"
+  assert_success
+  assert_output "ok"
+}